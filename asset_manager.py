@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from asset_pack import ASSET_PACK, AssetPack
+
+ASSET_WORKERS = 4
+# Hilos que decodifican imágenes y sonidos en segundo plano.
+
+
+class AssetManager:
+    def __init__(self, workers=ASSET_WORKERS, pack_path=ASSET_PACK):
+        # Carga de recursos compartida por `Game`, `LevelSelect` y `SpriteCache`. Cada recurso se
+        # pide por nombre dentro de un grupo ('start', 'sounds', ...); los grupos se decodifican en
+        # un pool de hilos en el orden en que se piden, y `get` solo espera si aún no está listo.
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='assets')
+        self.pack = AssetPack.open(pack_path)
+        # Si existe el paquete de `asset_pack.py` (versiones congeladas), los recursos salen de él
+        # ya escalados; lo que no esté en el paquete se carga de los archivos sueltos.
+        self.paths = {}
+        self.assets = {}
+        self.pending = {}
+        # Nombre -> recurso ya recogido, o futuro de la carga en curso.
+        self.groups = {}
+        # Grupo -> nombres pedidos en él, para el informe de arranque.
+        self.timings = {}
+        # Nombre -> segundos de decodificación.
+        self.finished = {}
+        # Grupo -> instante en que terminó su último recurso.
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def request(self, group, name, path, size=None, kind='image'):
+        # Encola la carga de `path`; las imágenes se escalan a `size` si se indica. Pedir de nuevo
+        # un nombre ya conocido no hace nada.
+        if name in self.assets or name in self.pending:
+            return
+        self.groups.setdefault(group, []).append(name)
+        self.paths[name] = path
+        self.pending[name] = self.pool.submit(self.load, group, name, path, size, kind)
+
+    def load(self, group, name, path, size, kind):
+        clock = time.perf_counter()
+        asset = None
+        if self.pack is not None:
+            asset = self.pack.sound(path) if kind == 'sound' else self.pack.image(path, size)
+        if asset is None and kind == 'sound':
+            asset = pygame.mixer.Sound(path)
+        elif asset is None:
+            asset = pygame.image.load(path)
+            if size is not None:
+                asset = pygame.transform.scale(asset, size)
+        now = time.perf_counter()
+        with self.lock:
+            self.timings[name] = now - clock
+            self.finished[group] = max(self.finished.get(group, now), now)
+        return asset
+
+    def get(self, name):
+        # Devuelve el recurso, esperando a que termine su carga si todavía está en curso.
+        asset = self.assets.get(name)
+        if asset is None:
+            asset = self.pending.pop(name).result()
+            # Los errores de carga (archivo que falta, etc.) se propagan aquí.
+            self.assets[name] = asset
+        return asset
+
+    def prescaled(self, name, size):
+        # Imagen `name` escalada de antemano a `size` en el paquete, o None si no la hay.
+        if self.pack is None:
+            return None
+        return self.pack.image(self.paths[name], size, exact=True)
+
+    def ready(self, name):
+        return name in self.assets or (name in self.pending and self.pending[name].done())
+
+    def idle(self):
+        # True cuando no queda ninguna carga en curso.
+        return all(future.done() for future in self.pending.values())
+
+    def report(self):
+        # Líneas del informe de arranque: por grupo, recursos, tiempo total de decodificación e
+        # instante (desde la creación del gestor) en que quedó listo.
+        lines = []
+        for group, names in self.groups.items():
+            decode = sum(self.timings.get(name, 0.0) for name in names)
+            ready = self.finished.get(group, self.started) - self.started
+            lines.append(f"{group:<14}{len(names):>4} recursos  {decode:7.3f} s decodificando  listo a los {ready:6.3f} s")
+        return lines
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,212 @@
+import argparse
+import fnmatch
+import glob
+import io
+import json
+import mmap
+import os
+import struct
+import wave
+# Paquete binario de recursos para las versiones empaquetadas: un solo archivo con un índice JSON
+# y, detrás, los píxeles ya escalados en RGBA crudo y los sonidos en WAV (PCM) o tal cual.
+
+import pygame
+
+from builtin_levels import BUILTIN_LEVELS
+
+ASSET_PACK = "assets.pack"
+MAGIC = b'SOKOPACK'
+HEADER = struct.Struct('<8sI')
+# Firma y longitud del índice JSON que va a continuación.
+IMAGE_DIRS = ('img_box', 'img_buttons', 'img_celebration', 'img_inicio', 'img_levels', 'img_player')
+SOUND_DIR = 'sounds'
+SCREEN_BACKGROUNDS = ('img_inicio/inicio.png', 'img_inicio/niveles.png', 'img_inicio/subniveles.png',
+                      'img_levels/level_background.png')
+# Fondos que el juego pide al tamaño de la ventana (`game.SCREEN_SIZE`).
+SCALED_SIZES = [
+    ('img_inicio/play_button*.png', (240, 140)),
+    ('img_inicio/level_blocks_*.png', (350, 250)),
+    ('img_buttons/sublevel_*.png', (200, 100)),
+    ('img_buttons/checkmark.png', (30, 30)),
+    ('img_buttons/cross.png', (30, 30)),
+    ('img_buttons/beach_ball.png', (40, 40)),
+    ('img_buttons/*.png', (50, 50)),
+    ('img_celebration/*.png', (100, 100)),
+]
+# Tamaños con que el juego pide cada imagen (primer patrón que coincide), escalados con
+# `pygame.transform.scale` igual que al cargarlos sueltos.
+MAX_PCM_SECONDS = 10
+# Los efectos más cortos se guardan ya decodificados a PCM; la música larga ocuparía decenas de
+# MB, así que se deja comprimida.
+SPRITE_PATTERNS = ('img_box/*.png', 'img_levels/crystal.png', 'img_levels/stone_wall.png', 'img_player/*.png')
+# Sprites de tile: se guardan a tamaño original y a los tamaños de tile de los niveles incluidos.
+
+
+def screen_size():
+    from game import SCREEN_SIZE
+    # Import diferido: `game` importa (a través de `asset_manager`) este módulo.
+    return SCREEN_SIZE
+
+
+def scaled_size(path):
+    # Tamaño al que el juego pide la imagen `path`, o None si la pide a tamaño original.
+    if path in SCREEN_BACKGROUNDS:
+        return screen_size()
+    return next((size for pattern, size in SCALED_SIZES if fnmatch.fnmatch(path, pattern)), None)
+
+
+def tile_sizes():
+    # Tamaños de tile de los niveles incluidos, con la misma fórmula que `Level.compute_layout`.
+    screen_width, screen_height = screen_size()
+    return sorted({min(screen_width // (len(layout[0]) + 2), screen_height // (len(layout) + 2))
+                   for layout in BUILTIN_LEVELS.values()})
+
+
+def image_key(path, size=None):
+    path = path.replace(os.sep, '/')
+    return path if size is None else f"{path}@{size[0]}x{size[1]}"
+
+
+class AssetPack:
+    def __init__(self, path=ASSET_PACK):
+        # Paquete abierto en modo lectura y proyectado en memoria: las imágenes se crean sobre los
+        # bytes del archivo sin decodificar nada.
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_length = HEADER.unpack_from(self.data)
+            if magic != MAGIC:
+                raise ValueError(f"{path} no es un paquete de recursos")
+            self.index = json.loads(bytes(self.data[HEADER.size:HEADER.size + index_length]).decode('utf-8'))
+            self.base = HEADER.size + index_length
+        except (ValueError, struct.error):
+            self.file.close()
+            raise
+        self.view = memoryview(self.data)
+        self.largest = {}
+        # Ruta -> entrada de mayor tamaño de cada imagen, de la que se escalan los tamaños que faltan.
+        for key, entry in self.index.items():
+            if entry['kind'] != 'image':
+                continue
+            path = key.split('@')[0]
+            width, height = entry['size']
+            best = self.largest.get(path)
+            if best is None or width * height > best['size'][0] * best['size'][1]:
+                self.largest[path] = entry
+
+    @classmethod
+    def open(cls, path=ASSET_PACK):
+        # Devuelve el paquete, o None si no existe o está dañado (se cargan los archivos sueltos).
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def entry_bytes(self, entry):
+        start = self.base + entry['offset']
+        return self.view[start:start + entry['length']]
+
+    def image(self, path, size=None, exact=False):
+        # Superficie de `path` al tamaño pedido. Si ese tamaño no está en el paquete (y no se pide
+        # `exact`), se escala desde la entrada más grande de la imagen, normalmente el original,
+        # sin recurrir a los archivos sueltos. None si la imagen no está en el paquete.
+        entry = self.index.get(image_key(path, size))
+        if entry is None and not exact:
+            entry = self.largest.get(image_key(path))
+        if entry is None:
+            return None
+        image = pygame.image.frombuffer(self.entry_bytes(entry), tuple(entry['size']), 'RGBA')
+        if size is not None and image.get_size() != tuple(size):
+            image = pygame.transform.scale(image, size)
+        return image
+
+    def sound(self, path):
+        entry = self.index.get(image_key(path))
+        if entry is None:
+            return None
+        return pygame.mixer.Sound(file=io.BytesIO(self.entry_bytes(entry)))
+
+    def close(self):
+        self.view.release()
+        self.data.close()
+        self.file.close()
+
+
+def sound_bytes(file_path):
+    # WAV con el PCM del sonido en el formato del mezclador, o el archivo original si es largo o
+    # no hay mezclador disponible. SDL convierte el WAV si en ejecución el formato es otro.
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        frequency, size, channels = pygame.mixer.get_init()
+        sound = pygame.mixer.Sound(file_path)
+    except pygame.error:
+        sound = None
+    if sound is None or size != -16 or sound.get_length() > MAX_PCM_SECONDS:
+        with open(file_path, 'rb') as sound_file:
+            return sound_file.read()
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frequency)
+        wav.writeframes(sound.get_raw())
+    return buffer.getvalue()
+
+
+def build_pack(output=ASSET_PACK, root='.'):
+    # Recorre los directorios de recursos y escribe el paquete de forma atómica. Devuelve el índice.
+    index = {}
+    blobs = []
+    offset = 0
+
+    def add(key, data, **info):
+        nonlocal offset
+        index[key] = dict(info, offset=offset, length=len(data))
+        blobs.append(data)
+        offset += len(data)
+
+    for directory in IMAGE_DIRS:
+        for file_path in sorted(glob.glob(os.path.join(root, directory, '*.png'))):
+            path = os.path.relpath(file_path, root).replace(os.sep, '/')
+            image = pygame.image.load(file_path)
+            if any(fnmatch.fnmatch(path, pattern) for pattern in SPRITE_PATTERNS):
+                add(image_key(path), pygame.image.tobytes(image, 'RGBA'), kind='image', size=image.get_size())
+                for tile_size in tile_sizes():
+                    size = (tile_size, tile_size)
+                    scaled = pygame.transform.smoothscale(image, size)
+                    # Igual que `SpriteCache`, que escala el original con `smoothscale`.
+                    add(image_key(path, size), pygame.image.tobytes(scaled, 'RGBA'), kind='image', size=size)
+                continue
+            size = scaled_size(path)
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            add(image_key(path, size), pygame.image.tobytes(image, 'RGBA'), kind='image', size=image.get_size())
+    for file_path in sorted(glob.glob(os.path.join(root, SOUND_DIR, '*'))):
+        add(image_key(os.path.relpath(file_path, root)), sound_bytes(file_path), kind='sound')
+
+    encoded = json.dumps(index, sort_keys=True).encode('utf-8')
+    temporary = output + '.tmp'
+    with open(temporary, 'wb') as pack_file:
+        pack_file.write(HEADER.pack(MAGIC, len(encoded)))
+        pack_file.write(encoded)
+        for data in blobs:
+            pack_file.write(data)
+    os.replace(temporary, output)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Empaqueta imágenes y sonidos en un único archivo para las versiones congeladas.")
+    parser.add_argument('-o', '--output', default=ASSET_PACK, help="archivo de salida")
+    parser.add_argument('--root', default='.', help="directorio con las carpetas img_* y sounds")
+    args = parser.parse_args(argv)
+    index = build_pack(args.output, args.root)
+    print(f"{args.output}: {len(index)} recursos, {os.path.getsize(args.output) // 1024} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import multiprocessing
+import queue
+import time
+# La búsqueda corre en otro proceso: así no compite por el GIL con el bucle de pygame.
+
+from hint_engine import HintEngine
+from level_pack import HeadlessLevel
+from solution_cache import SolutionCache
+from solver import Solver
+
+CANCEL_TIMEOUT = 0.5
+# Segundos que se espera a que el proceso termine por sí solo antes de forzarlo.
+
+
+def run_solver(level, solver_options, cache_path, messages, cancel_event, known=None):
+    # Punto de entrada del proceso hijo: resuelve e informa del progreso por la cola.
+    # `known` son los estados aprendidos por el `HintEngine` del juego: si el nivel está en uno de
+    # ellos o cerca, la reparación acotada da el camino sin búsqueda completa.
+    def report(stats):
+        messages.put(('progress', stats.nodes_expanded, stats.elapsed))
+        return not cancel_event.is_set()
+
+    if known is not None:
+        hints = HintEngine()
+        hints.reset(level)
+        if hints.solver is not None:
+            hints.known.distance, hints.known.next_push = known
+            path = hints.plan(level)
+            if path is not None:
+                messages.put(('done', path, 'solved', hints.solver.nodes))
+                return
+
+    cache = SolutionCache(cache_path) if cache_path else None
+    solver = Solver(on_progress=report, cache=cache, **solver_options)
+    path = solver.solve(level)
+    messages.put(('done', path, solver.status, solver.nodes))
+
+
+class BackgroundSolver:
+    def __init__(self, cache_path=None, **solver_options):
+        # Las opciones se pasan tal cual a `Solver` dentro del proceso hijo; `cache_path`
+        # activa el almacén de soluciones en disco (cada proceso abre su propio `SolutionCache`).
+        self.cache_path = cache_path
+        self.solver_options = solver_options
+        self.process = None
+        self.messages = None
+        self.cancel_event = None
+        self.nodes = 0
+        self.started = 0
+        self.status = None
+
+    @property
+    def running(self):
+        return self.process is not None
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started if self.running else 0
+
+    def start(self, level, known=None):
+        # Lanza la búsqueda sobre una copia del estado actual del nivel (con los estados conocidos
+        # de `HintEngine.known_states`, si los hay).
+        self.cancel()
+        self.messages = multiprocessing.Queue()
+        self.cancel_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=run_solver,
+            args=(HeadlessLevel.snapshot(level), self.solver_options, self.cache_path, self.messages,
+                  self.cancel_event, known),
+            daemon=True,
+        )
+        self.nodes = 0
+        self.status = None
+        self.started = time.time()
+        self.process.start()
+
+    def poll(self):
+        # Vacía la cola sin bloquear. Devuelve (terminado, camino).
+        if not self.running:
+            return False, None
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'progress':
+                self.nodes = message[1]
+            else:
+                _, path, self.status, self.nodes = message
+                self.finish()
+                return True, path
+        if not self.process.is_alive() and self.messages.empty():
+            self.status = 'failed'
+            self.finish()
+            return True, None
+            # El proceso murió sin enviar resultado.
+        return False, None
+
+    def cancel(self):
+        # Pide al proceso que pare en su próxima comprobación y, si no lo hace a tiempo, lo termina.
+        if not self.running:
+            return
+        self.cancel_event.set()
+        self.process.join(CANCEL_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.status = 'cancelled'
+        self.finish()
+
+    def finish(self):
+        self.process.join()
+        self.messages.close()
+        self.process = None
+        self.messages = None
+        self.cancel_event = None
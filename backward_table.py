@@ -0,0 +1,102 @@
+from heuristic import INF
+
+BACKWARD_STATES = 200000
+# Estados que guarda como máximo la búsqueda hacia atrás.
+
+
+class BackwardTable:
+    def __init__(self, board, box_count, limit=BACKWARD_STATES):
+        # Búsqueda en anchura hacia atrás desde el objetivo "tirando" de las cajas: cada tirón
+        # deshace un empuje. Guarda la distancia exacta en empujes de los estados cercanos a la
+        # solución, con las mismas claves (cajas, celda canónica) que la búsqueda hacia delante.
+        self.board = board
+        self.box_count = box_count
+        self.limit = limit
+        self.distance = {}
+        self.next_push = {}
+        # next_push[clave] = (clave siguiente, caja, dirección): el empuje que acerca al objetivo.
+        self.layer = []
+        self.next_layer = []
+        self.position = 0
+        # Capa que se está expandiendo (a distancia `depth`), la siguiente y el avance en la actual.
+        self.depth = -1
+        # Todos los estados a `depth` empujes o menos del objetivo están en la tabla.
+        self.expanded = 0
+        self.growing = False
+        # Indica si aún quedan estados por expandir sin pasar de `limit`.
+        self.complete = False
+        # Si la búsqueda se agotó, cualquier estado fuera de la tabla no tiene solución.
+
+    def start(self):
+        # Siembra la capa 0: un estado final por cada zona en la que puede acabar el jugador.
+        board = self.board
+        goal = board.target_bits
+        if len(board.targets) != self.box_count:
+            return
+            # Con más objetivos que cajas hay muchas configuraciones finales: no se usa la tabla.
+        seen = bytearray(board.size)
+        for cell in range(board.size):
+            if goal >> cell & 1 or seen[cell]:
+                continue
+            reach, canonical = board.reachable(cell, goal)
+            for region_cell in range(board.size):
+                seen[region_cell] |= reach[region_cell]
+            key = board.key(goal, canonical)
+            self.distance[key] = 0
+            self.next_push[key] = None
+            self.layer.append(key)
+        self.depth = 0
+        self.growing = True
+
+    def expand(self):
+        # Expande un estado de la capa en curso; al acabarla, la siguiente pasa a ser la actual.
+        # Así la búsqueda hacia atrás puede intercalarse con la de delante de estado en estado.
+        if self.position == len(self.layer):
+            if not self.next_layer:
+                self.complete = True
+                self.growing = False
+                return
+            self.layer, self.next_layer, self.position = self.next_layer, [], 0
+            self.depth += 1
+        if len(self.distance) >= self.limit:
+            self.growing = False
+            return
+        key = self.layer[self.position]
+        self.position += 1
+        self.expanded += 1
+        for new_key, box, direction in self.pulls(key):
+            if new_key not in self.distance:
+                self.distance[new_key] = self.depth + 1
+                self.next_push[new_key] = (key, box, direction)
+                self.next_layer.append(new_key)
+                # En anchura, la primera vez que se alcanza un estado es por el camino más corto.
+
+    def pulls(self, key):
+        # Tirones desde un estado: (clave nueva, celda de la caja, dirección del empuje que lo deshace).
+        board = self.board
+        box_bits, player = board.split_key(key)
+        reach, _ = board.reachable(player, box_bits)
+        result = []
+        for new_boxes, back, cell, direction in board.pulls(box_bits, reach):
+            _, canonical = board.reachable(back, new_boxes)
+            result.append((board.key(new_boxes, canonical), cell, direction))
+            # Hacia delante: el jugador en `back` empuja la caja de `cell` en `direction`.
+        return result
+
+    def estimate(self, key, value):
+        # Mejora una cota inferior `value`: distancia exacta dentro de la tabla y, fuera, al menos
+        # una capa más de las que se han recorrido.
+        distance = self.distance.get(key)
+        if distance is not None:
+            return distance
+        if self.complete:
+            return INF
+        return max(value, self.depth + 1)
+
+    def pushes_from(self, key):
+        # Empujes (caja, dirección) que llevan de un estado de la tabla al objetivo.
+        pushes = []
+        while self.next_push[key] is not None:
+            key, box, direction = self.next_push[key]
+            pushes.append((box, direction))
+        return pushes
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+# Resolución por lotes sin interfaz: solo usa el solver y el lector de colecciones (ni pygame ni cv2).
+
+from level_pack import HeadlessLevel, decode_lurd, encode_lurd, load_levels
+from parallel_solver import ParallelSolver
+from solution_cache import DEFAULT_CACHE_PATH, SolutionCache
+from solver import Solver
+
+
+def solve_level(level_data, options):
+    # Resuelve un nivel en un proceso del pool y devuelve una fila serializable en JSON.
+    cache = SolutionCache(options['cache'], autosave=False) if options['cache'] else None
+    # Los procesos solo leen el almacén; el proceso principal es el único que lo escribe.
+    solver_options = {'mode': options['mode'], 'time_limit': options['time_limit'],
+                      'node_limit': options['node_limit'], 'cache': cache}
+    if options['engine'] == 'hda':
+        solver = ParallelSolver(workers=options['workers'], **solver_options)
+        # Un nivel repartido entre varios procesos; conviene combinarlo con -j 1.
+    else:
+        solver = Solver(engine=options['engine'], memory_mb=options['memory_mb'], patterns=options['patterns'],
+                        pattern_combine=options['pattern_combine'], **solver_options)
+    path, stats = solver.solve_with_stats(HeadlessLevel(level_data))
+    solution = encode_lurd(level_data, path) if path is not None else None
+    return {
+        'pack': level_data.get('pack'),
+        'number': level_data['number'],
+        'name': level_data['name'],
+        'status': stats.status,
+        'solution': solution,
+        'length': len(solution) if solution is not None else None,
+        'pushes': sum(letter.isupper() for letter in solution) if solution is not None else None,
+        'nodes': stats.nodes_expanded,
+        'cached': stats.cache_hit,
+        'time': round(stats.elapsed, 4),
+        'stats': stats.as_dict(),
+    }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Resuelve colecciones de niveles Sokoban en paralelo.")
+    parser.add_argument('path', help="archivo XSB o directorio con colecciones (.xsb, .sok, .txt)")
+    parser.add_argument('-o', '--output', help="archivo JSONL de salida (por defecto, la salida estándar)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="procesos en paralelo")
+    parser.add_argument('--time-limit', type=float, default=None, help="segundos máximos por nivel")
+    parser.add_argument('--node-limit', type=int, default=None, help="nodos expandidos máximos por nivel")
+    parser.add_argument('--mode', choices=['push', 'step'], default='push')
+    parser.add_argument('--engine', choices=['astar', 'ida', 'bidirectional', 'hda'], default='astar')
+    parser.add_argument('--memory-mb', type=int, default=64, help="tamaño de la tabla de transposición de 'ida'")
+    parser.add_argument('--workers', type=int, default=None, help="procesos por nivel del motor 'hda'")
+    parser.add_argument('--patterns', type=int, choices=[2, 3], default=None,
+                        help="usa bases de datos de patrones sobre grupos de 2 o 3 objetivos")
+    parser.add_argument('--pattern-combine', choices=['add', 'max'], default='add')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, default=None,
+                        help="consulta y precarga el almacén de soluciones (ruta opcional)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    levels = load_levels(args.path)
+    options = {
+        'mode': args.mode,
+        'engine': args.engine,
+        'memory_mb': args.memory_mb,
+        'time_limit': args.time_limit,
+        'node_limit': args.node_limit,
+        'workers': args.workers,
+        'patterns': args.patterns,
+        'pattern_combine': args.pattern_combine,
+        'cache': args.cache,
+    }
+    cache = SolutionCache(args.cache, autosave=False) if args.cache else None
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = {pool.submit(solve_level, level_data, options): level_data for level_data in levels}
+            for future in as_completed(futures):
+                level_data = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    result = {'pack': level_data.get('pack'), 'number': level_data['number'],
+                              'name': level_data['name'], 'status': 'error', 'error': repr(exc)}
+                    # Un nivel que falla no detiene el lote: se anota y se sigue con los demás.
+                output.write(json.dumps(result, ensure_ascii=False) + '\n')
+                output.flush()
+                # Cada resultado se escribe en cuanto su nivel termina.
+                if cache is not None and result.get('solution') is not None and not result['cached']:
+                    cache.store_level(HeadlessLevel(level_data), decode_lurd(result['solution']))
+    finally:
+        if cache is not None:
+            cache.save()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import sys
+# Benchmark del solver: niveles del juego más las colecciones de `benchmarks/`, sin pygame.
+
+from builtin_levels import BUILTIN_LEVELS
+from level_pack import HeadlessLevel, encode_lurd, load_levels
+from parallel_solver import ParallelSolver
+from solver import Solver
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+MIN_TIME = 0.05
+# Por debajo de estos segundos las diferencias de tiempo son ruido y no se marcan.
+
+
+def benchmark_levels(path=BENCHMARK_DIR):
+    # Niveles del juego (como en `LevelSelect.load_level`) seguidos de las colecciones XSB.
+    levels = []
+    for number, rows in sorted(BUILTIN_LEVELS.items()):
+        levels.append({'number': number, 'name': f"builtin/{number}", 'layout': [list(row) for row in rows]})
+    for level_data in load_levels(path):
+        level_data['name'] = f"{level_data['pack']}/{level_data['number']}"
+        levels.append(level_data)
+    return levels
+
+
+def make_solver(solver_options):
+    if solver_options['engine'] == 'hda':
+        options = dict(solver_options)
+        del options['engine'], options['memory_mb'], options['patterns'], options['pattern_combine']
+        return ParallelSolver(**options)
+    options = dict(solver_options)
+    del options['workers']
+    return Solver(**options)
+
+
+def run_level(level_data, solver_options, repeat):
+    # Resuelve el nivel `repeat` veces y se queda con el menor tiempo (los nodos son deterministas
+    # salvo con el motor 'hda').
+    best = None
+    for _ in range(repeat):
+        path, stats = make_solver(solver_options).solve_with_stats(HeadlessLevel(level_data))
+        if best is None or stats.elapsed < best[1].elapsed:
+            best = (path, stats)
+    path, stats = best
+    moves = encode_lurd(level_data, path) if path is not None else None
+    return {
+        'status': stats.status,
+        'time': round(stats.elapsed, 4),
+        'nodes': stats.nodes_expanded,
+        'memory': stats.memory_bytes,
+        'length': len(moves) if moves is not None else None,
+        'pushes': sum(letter.isupper() for letter in moves) if moves is not None else None,
+    }
+
+
+def compare(result, baseline, threshold):
+    # Devuelve la lista de regresiones de un nivel respecto a su línea base.
+    problems = []
+    if baseline is None:
+        return problems
+    if baseline['status'] == 'solved' and result['status'] != 'solved':
+        problems.append(f"ya no se resuelve ({result['status']})")
+        return problems
+    for field in ('nodes', 'memory'):
+        if baseline[field] and result[field] > baseline[field] * (1 + threshold):
+            problems.append(f"{field} {baseline[field]} -> {result[field]}")
+    if result['time'] >= MIN_TIME and result['time'] > baseline['time'] * (1 + threshold):
+        problems.append(f"time {baseline['time']} -> {result['time']}")
+    if baseline['pushes'] is not None and result['pushes'] is not None and result['pushes'] > baseline['pushes']:
+        problems.append(f"pushes {baseline['pushes']} -> {result['pushes']}")
+        # Con una heurística admisible el número de empujes nunca debería crecer.
+    return problems
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark y regresiones del solver de Sokoban.")
+    parser.add_argument('--levels', default=BENCHMARK_DIR, help="directorio o archivo XSB adicional")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="archivo JSON con la línea base")
+    parser.add_argument('--update-baseline', action='store_true', help="guarda los resultados como nueva línea base")
+    parser.add_argument('--threshold', type=float, default=0.25, help="margen relativo antes de marcar una regresión")
+    parser.add_argument('--repeat', type=int, default=3, help="repeticiones por nivel (se usa el menor tiempo)")
+    parser.add_argument('--filter', default='', help="solo niveles cuyo nombre contenga este texto")
+    parser.add_argument('--time-limit', type=float, default=120)
+    parser.add_argument('--mode', choices=['push', 'step'], default='push')
+    parser.add_argument('--engine', choices=['astar', 'ida', 'bidirectional', 'hda'], default='astar')
+    parser.add_argument('--memory-mb', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=None, help="procesos del motor 'hda'")
+    parser.add_argument('--patterns', type=int, choices=[2, 3], default=None, help="tamaño de los grupos de patrones")
+    parser.add_argument('--pattern-combine', choices=['add', 'max'], default='add')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    solver_options = {'mode': args.mode, 'engine': args.engine, 'memory_mb': args.memory_mb,
+                      'time_limit': args.time_limit, 'workers': args.workers, 'patterns': args.patterns,
+                      'pattern_combine': args.pattern_combine}
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {}
+    regressions = 0
+    print(f"{'nivel':<16}{'estado':<12}{'tiempo':>9}{'nodos':>10}{'memoria':>12}{'pasos':>7}{'empujes':>9}")
+    for level_data in benchmark_levels(args.levels):
+        name = level_data['name']
+        if args.filter not in name:
+            continue
+        result = run_level(level_data, solver_options, args.repeat)
+        results[name] = result
+        problems = compare(result, baseline.get(name), args.threshold)
+        regressions += bool(problems)
+        print(f"{name:<16}{result['status']:<12}{result['time']:>9.3f}{result['nodes']:>10}"
+              f"{result['memory'] // 1024:>10}KB{result['length'] or '-':>7}{result['pushes'] or '-':>9}"
+              + (f"  REGRESIÓN: {'; '.join(problems)}" if problems else ''))
+        sys.stdout.flush()
+
+    total_time = sum(result['time'] for result in results.values())
+    total_nodes = sum(result['nodes'] for result in results.values())
+    print(f"total: {len(results)} niveles, {total_time:.2f} s, {total_nodes} nodos, {regressions} con regresiones")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+    return 1 if regressions and not args.update_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
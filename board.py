@@ -0,0 +1,137 @@
+import random
+# se usa para generar las claves Zobrist con una semilla fija.
+from collections import deque
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+# Las cuatro direcciones; su índice (0-3) es el que usan las tablas de movimientos.
+
+
+class Board:
+    def __init__(self, level):
+        # Compila una sola vez la parte estática del nivel en índices de celda.
+        self.walls = set(level.walls)
+        self.cells = self.find_floor(tuple(level.player_pos))
+        # Solo se indexan las celdas interiores; el resto se trata como pared.
+        self.cells.sort(key=lambda cell: (cell[1], cell[0]))
+        self.size = len(self.cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+        self.moves = []
+        # moves[i][d] es la celda vecina de i en la dirección d, o -1 si es pared.
+        for x, y in self.cells:
+            self.moves.append(tuple(self.index.get((x + dx, y + dy), -1) for dx, dy in DIRECTIONS))
+
+        self.targets = [self.index[cell] for cell in level.targets if cell in self.index]
+        self.target_bits = self.pack(self.targets)
+
+        rng = random.Random(0x50C0BA)
+        self.box_keys = [rng.getrandbits(64) for _ in range(self.size)]
+        self.player_keys = [rng.getrandbits(64) for _ in range(self.size)]
+        # Claves Zobrist: el hash de un estado es el XOR de las claves de sus cajas y del jugador.
+
+    def find_floor(self, start):
+        # Celdas interiores: las que el jugador alcanzaría si no hubiera cajas.
+        floor = {start}
+        queue = deque([start])
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in DIRECTIONS:
+                cell = (x + dx, y + dy)
+                if cell not in floor and cell not in self.walls:
+                    floor.add(cell)
+                    queue.append(cell)
+        return list(floor)
+
+    def pack(self, cells):
+        # Convierte una lista de índices de celda en un bitboard (un entero).
+        bits = 0
+        for cell in cells:
+            bits |= 1 << cell
+        return bits
+
+    def unpack(self, bits):
+        # Lista de índices de celda presentes en un bitboard.
+        cells = []
+        while bits:
+            low = bits & -bits
+            cells.append(low.bit_length() - 1)
+            bits ^= low
+        return cells
+
+    def pack_boxes(self, boxes):
+        # Bitboard de cajas a partir de coordenadas (x, y), o None si alguna caja está fuera de
+        # las celdas interiores (encerrada donde el jugador no llega).
+        if any(tuple(box) not in self.index for box in boxes):
+            return None
+        return self.pack(self.index[tuple(box)] for box in boxes)
+
+    def key(self, box_bits, player):
+        # Empaqueta cajas y jugador en un único entero que sirve de clave de estado.
+        return box_bits * self.size + player
+
+    def split_key(self, key):
+        # Operación inversa de `key`: devuelve (bitboard de cajas, celda del jugador).
+        return divmod(key, self.size)
+
+    def zobrist(self, box_bits, player):
+        # Hash Zobrist completo; durante la búsqueda se actualiza de forma incremental.
+        value = self.player_keys[player]
+        for cell in self.unpack(box_bits):
+            value ^= self.box_keys[cell]
+        return value
+
+    def reachable(self, player, box_bits):
+        # Flood-fill de las celdas que el jugador alcanza sin mover cajas.
+        # Devuelve la zona como bytearray y la celda canónica (el menor índice).
+        seen = bytearray(self.size)
+        seen[player] = 1
+        stack = [player]
+        canonical = player
+        moves = self.moves
+        while stack:
+            cell = stack.pop()
+            if cell < canonical:
+                canonical = cell
+            for neighbor in moves[cell]:
+                if neighbor >= 0 and not seen[neighbor] and not box_bits >> neighbor & 1:
+                    seen[neighbor] = 1
+                    stack.append(neighbor)
+        return seen, canonical
+
+    def pulls(self, box_bits, reach):
+        # Tirones posibles desde la zona `reach` del jugador: (cajas nuevas, celda a la que
+        # retrocede el jugador, celda nueva de la caja, dirección). Cada tirón deshace el empuje
+        # de la caja desde su celda nueva en esa dirección.
+        moves = self.moves
+        result = []
+        for box in self.unpack(box_bits):
+            for direction in range(4):
+                cell = moves[box][direction ^ 2]
+                # El jugador está junto a la caja, en `cell`, y retrocede alejándose de ella.
+                if cell < 0 or not reach[cell]:
+                    continue
+                back = moves[cell][direction ^ 2]
+                if back < 0 or box_bits >> back & 1:
+                    continue
+                result.append((box_bits ^ (1 << box) ^ (1 << cell), back, cell, direction))
+        return result
+
+    def walk(self, start, goal, box_bits):
+        # Camino más corto (BFS) del jugador entre dos celdas, como lista de direcciones.
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            if cell == goal:
+                break
+            for direction, neighbor in enumerate(self.moves[cell]):
+                if neighbor >= 0 and neighbor not in came_from and not box_bits >> neighbor & 1:
+                    came_from[neighbor] = (cell, direction)
+                    queue.append(neighbor)
+        steps = []
+        cell = goal
+        while came_from[cell] is not None:
+            cell, direction = came_from[cell]
+            steps.append(DIRECTIONS[direction])
+        steps.reverse()
+        return steps
@@ -0,0 +1,105 @@
+# Distribuciones de los niveles incluidos en el juego, sin dependencias de pygame para que
+# el solver por lotes y los benchmarks puedan usarlas.
+
+BUILTIN_LEVELS = {
+    # Nivel I
+
+    1: [
+        "#######",
+        "#     #",
+        "#     #",
+        "#  $  #",
+        "#  .  #",
+        "#  @  #",
+        "#######"
+    ],
+
+    2: [
+        "########",
+        "#      #",
+        "#  $   #",
+        "#     ##",
+        "#  @   #",
+        "#     ##",
+        "#  .   #",
+        "########"
+    ],
+
+    3: [
+        "#########",
+        "#       #",
+        "#   @   #",
+        "# $     #",
+        "#####  ##",
+        "#   #   #",
+        "#   .   #",
+        "#       #",
+        "#########"
+    ],
+    # Nivel II
+    # 1
+    4: [
+        "########",
+        "#   .. #",
+        "#  @$$ #",
+        "##### ##",
+        "#      #",
+        "#      #",
+        "#      #",
+        "########"
+    ],
+    # 15
+    5: [
+        "####    ",
+        "#  #### ",
+        "#     # ",
+        "#     # ",
+        "### ### ",
+        "# $$  ##",
+        "# . .@ #",
+        "####   #",
+        "   #####"
+    ],
+    # 28
+    6: [
+        "  #### ",
+        "  #  # ",
+        "###  # ",
+        "#  $$##",
+        "# . . #",
+        "###  @#",
+        "  #####"
+    ],
+    # Nivel III
+    # 150
+    7: [
+        "#####  ",
+        "#.  ###",
+        "# # $@#",
+        "# . # #",
+        "#  .$ #",
+        "##$ ###",
+        " #  #  ",
+        " ####  "
+    ],
+    # 203
+    8: [
+        "####  ",
+        "#  ###",
+        "# $$ #",
+        "#... #",
+        "# @$ #",
+        "#   ##",
+        "##### "
+    ],
+    # 182
+    9: [
+        " #######",
+        " #     #",
+        " # .$. #",
+        "## $@$ #",
+        "#  .$. #",
+        "#      #",
+        "########"
+    ]
+}
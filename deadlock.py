@@ -0,0 +1,97 @@
+from collections import deque
+# se usa para el recorrido en anchura sobre el tablero.
+
+HORIZONTAL = (3, 1)
+VERTICAL = (2, 0)
+# Pares de direcciones (índices de `board.DIRECTIONS`) que forman cada eje.
+
+
+class DeadlockDetector:
+    def __init__(self, board):
+        # Precalcula, una sola vez por nivel, las casillas muertas del tablero compilado.
+        self.board = board
+        self.is_target = bytearray(board.size)
+        for cell in board.targets:
+            self.is_target[cell] = 1
+        self.dead = self.find_dead_squares()
+
+    def find_dead_squares(self):
+        # Una casilla está viva si una caja puede llegar desde ella a algún objetivo.
+        # Se calcula "tirando" de una caja hacia atrás desde cada objetivo.
+        moves = self.board.moves
+        live = bytearray(self.board.size)
+        queue = deque(self.board.targets)
+        for cell in self.board.targets:
+            live[cell] = 1
+        while queue:
+            cell = queue.popleft()
+            for direction in range(4):
+                box_cell = moves[cell][direction]
+                # Para tirar de la caja hasta box_cell el jugador necesita pisar box_cell y la siguiente.
+                if box_cell < 0 or live[box_cell] or moves[box_cell][direction] < 0:
+                    continue
+                live[box_cell] = 1
+                queue.append(box_cell)
+        return bytearray(1 - flag for flag in live)
+
+    def is_dead_state(self, box_bits):
+        # Comprueba si alguna caja del estado inicial ya está en una casilla muerta.
+        return any(self.dead[cell] for cell in self.board.unpack(box_bits))
+
+    def is_deadlock(self, box, box_bits):
+        # Comprueba si la caja recién empujada a `box` deja el nivel sin solución.
+        if self.dead[box]:
+            return True
+        if self.is_square_block(box, box_bits):
+            return True
+        group = []
+        if self.is_frozen(box, box_bits, set(), group):
+            return any(not self.is_target[cell] for cell in group)
+            # Un grupo de cajas congeladas solo es válido si todas están sobre objetivos.
+        return False
+
+    def is_square_block(self, box, box_bits):
+        # Detecta un bloque 2x2 de paredes y cajas con alguna caja fuera de objetivo.
+        moves = self.board.moves
+        for side in HORIZONTAL:
+            for vertical in VERTICAL:
+                beside = moves[box][side]
+                above = moves[box][vertical]
+                corner = moves[beside][vertical] if beside >= 0 else moves[above][side] if above >= 0 else -1
+                square = (box, beside, above, corner)
+                if all(cell < 0 or box_bits >> cell & 1 for cell in square):
+                    if any(cell >= 0 and not self.is_target[cell] for cell in square):
+                        return True
+        return False
+
+    def is_frozen(self, box, box_bits, seen, group):
+        # Una caja está congelada si está bloqueada en el eje horizontal y en el vertical.
+        # Las cajas que se están comprobando se tratan como paredes para evitar ciclos.
+        seen.add(box)
+        frozen = self.check_axes(box, box_bits, seen, group)
+        seen.discard(box)
+        return frozen
+
+    def check_axes(self, box, box_bits, seen, group):
+        moves = self.board.moves
+        for first, second in (HORIZONTAL, VERTICAL):
+            before = moves[box][first]
+            after = moves[box][second]
+            if before < 0 or after < 0 or before in seen or after in seen:
+                continue
+                # Bloqueada por una pared (o una caja tratada como pared) en este eje.
+            if self.dead[before] and self.dead[after]:
+                continue
+                # Moverla en este eje solo la llevaría a una casilla muerta.
+            blocked = False
+            for neighbor in (before, after):
+                if box_bits >> neighbor & 1:
+                    neighbor_group = []
+                    if self.is_frozen(neighbor, box_bits, seen, neighbor_group):
+                        group.extend(neighbor_group)
+                        blocked = True
+                        break
+            if not blocked:
+                return False
+        group.append(box)
+        return True
@@ -1,22 +1,70 @@
+import argparse
 import pygame
 import os
 import time
+import multiprocessing
 from level_select import LevelSelect
 from level import Level
 from player import Player
-from solver import Solver
-import cv2
+from asset_manager import AssetManager
+from background_solver import BackgroundSolver
+from hint_engine import HintEngine
+from solution_cache import DEFAULT_CACHE_PATH
+from sprite_cache import SpriteCache
+from text_cache import TextCache
+from video_stream import VideoStream
+
+TILE_IMAGES = {
+    'wooden_box': "img_box/wooden_box.png",
+    'crystal': "img_levels/crystal.png",
+    'stone_wall': "img_levels/stone_wall.png",
+    'player_up': "img_player/player_up.png",
+    'player_down': "img_player/player_down.png",
+    'player_left': "img_player/player_left.png",
+    'player_right': "img_player/player_right.png",
+}
+# Imágenes que se dibujan al tamaño de tile del nivel, escaladas una vez en `SpriteCache`.
+LEVEL_TILES = ('wooden_box', 'crystal', 'stone_wall')
+PLAYER_DIRECTIONS = ('up', 'down', 'left', 'right')
+FRAME_RATE = 60
+SCREEN_SIZE = (800, 600)
+# Tamaño de la ventana; `asset_pack.py` escala los fondos y los tiles del paquete a partir de él.
+IDLE_TIMEOUT = 250
+# Milisegundos máximos que el bucle espera eventos sin nada que redibujar (para sondear las cargas).
+BUSY_TIMEOUT = 100
+# Espera máxima mientras corre el solver: el texto de progreso se refresca a este ritmo.
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED,
+                 pygame.WINDOWSIZECHANGED)
+# Eventos tras los que la ventana hay que repintarla entera.
 
 class Game:
-    def __init__(self):
+    def __init__(self, profile_startup=False, event_driven=True):
         pygame.init()
-        self.screen = pygame.display.set_mode((800, 600))
+        self.screen = pygame.display.set_mode(SCREEN_SIZE)
         pygame.display.set_caption("Sokoban - UVP")
         self.clock = pygame.time.Clock()
         self.running = True
         self.state = 'start'  # 'start', 'level_select', 'playing', 'game_completed'
-        
-        self.level_select = LevelSelect()
+        self.profile_startup = profile_startup
+        self.first_frame_time = None
+        # Con `profile_startup`, al terminar las cargas se imprime el tiempo por grupo de recursos.
+        self.event_driven = event_driven
+        self.dirty = True
+        # En modo por eventos solo se redibuja cuando algo marca la escena como sucia (entrada,
+        # reproducción de la solución, progreso del solver); si no, se bloquea esperando eventos.
+
+        self.assets = AssetManager()
+        # Los recursos se decodifican en segundo plano, en el orden en que se piden: primero lo
+        # que necesita la pantalla de inicio y después el resto.
+        self.load_images()
+        self.load_button_images()
+        self.load_sounds()
+        self.music_started = False
+        self.texts = TextCache()
+        # Textos ya renderizados, compartidos con la selección de niveles.
+        self.level_select = LevelSelect(self.assets, self.texts)
+        self.load_sublevel_buttons()
+        self.load_celebration_images()
         self.current_level = None
         self.player = None
         
@@ -24,30 +72,32 @@ class Game:
         self.moves_history = []
         
         self.play_button_hovered = False
+        self.drawn_level = None
+        self.dirty_rects = []
+        # Nivel dibujado en el último frame y rectángulos que ocupaban sus partes móviles.
         
-        self.load_sounds()
         self.sound_enabled = True
         
         self.load_fonts()
-        self.load_images()
-        self.load_button_images()
-        self.load_celebration_images()
-        self.load_sublevel_buttons()
-        self.load_celebration_video()
 
-        self.solver = Solver()
+        self.solver = BackgroundSolver(cache_path=DEFAULT_CACHE_PATH)
+        self.hints = HintEngine()
+        # Recuerda las soluciones del nivel actual para dar pistas sin volver a buscar.
+        self.solve_start = None
+        self.autoplay = True
+        # Con False, la solución de la búsqueda en segundo plano solo se aprende (pista con H).
         self.solution = None
         self.solution_index = 0
         self.solution_delay = 0.5
         self.last_solution_move_time = 0
 
     def load_sounds(self):
-        self.background_music = pygame.mixer.Sound("sounds/background.mp3")
-        self.move_sound = pygame.mixer.Sound("sounds/move.mp3")
-        self.box_sound = pygame.mixer.Sound("sounds/box.mp3")
-        self.victory_sound = pygame.mixer.Sound("sounds/victory.mp3")
-        self.celebration_sound = pygame.mixer.Sound("sounds/victory.mp3")
-        self.background_music.play(-1)
+        self.assets.request('sounds', 'background_music', "sounds/background.mp3", kind='sound')
+        self.assets.request('sounds', 'move_sound', "sounds/move.mp3", kind='sound')
+        self.assets.request('sounds', 'box_sound', "sounds/box.mp3", kind='sound')
+        self.assets.request('sounds', 'victory_sound', "sounds/victory.mp3", kind='sound')
+        self.assets.request('sounds', 'celebration_sound', "sounds/victory.mp3", kind='sound')
+        # La música empieza en `update` en cuanto termina de decodificarse.
 
     def load_fonts(self):
         pygame.font.init()
@@ -59,92 +109,104 @@ class Game:
         self.title_font = pygame.font.Font(None, 48)
 
     def load_images(self):
-        screen_width, screen_height = self.screen.get_size()
-        
-        tile_size = min(screen_width // 10, screen_height // 10)
-
-        self.images = {
-            'wooden_box': self.load_and_scale("img_box/wooden_box.png", tile_size),
-            'crystal': self.load_and_scale("img_levels/crystal.png", tile_size),
-            'stone_wall': self.load_and_scale("img_levels/stone_wall.png", tile_size),
-            'background': pygame.transform.scale(pygame.image.load("img_inicio/inicio.png"), (screen_width, screen_height)),
-            'level_select_background': pygame.transform.scale(pygame.image.load("img_inicio/niveles.png"), (screen_width, screen_height)),
-            'sublevel_select_background': pygame.transform.scale(pygame.image.load("img_inicio/subniveles.png"), (screen_width, screen_height)),
-            'level_background': pygame.transform.scale(pygame.image.load("img_levels/level_background.png"), (screen_width, screen_height)),
-        }
-
-        self.level_blocks = []
+        screen_size = self.screen.get_size()
+        self.assets.request('start', 'background', "img_inicio/inicio.png", screen_size)
+        self.assets.request('level_select', 'level_select_background', "img_inicio/niveles.png", screen_size)
+        self.assets.request('level_select', 'sublevel_select_background', "img_inicio/subniveles.png", screen_size)
+        self.assets.request('level', 'level_background', "img_levels/level_background.png", screen_size)
         for i in range(3):
-            block = pygame.image.load(f"img_inicio/level_blocks_{i+1}.png")
-            block = pygame.transform.scale(block, (350, 250))
-            self.level_blocks.append(block)
-
-    def load_and_scale(self, image_path, size):
-        image = pygame.image.load(image_path)
-        return pygame.transform.smoothscale(image, (size, size))
+            self.assets.request('level_select', f'level_block_{i + 1}', f"img_inicio/level_blocks_{i + 1}.png", (350, 250))
+
+        self.sprites = SpriteCache(self.assets)
+        self.level_images = None
+        self.player_images = None
+        self.sprite_screen_size = None
+
+    def prepare_sprites(self):
+        # Escala los tiles y el jugador al tamaño de tile del nivel actual. Se llama al empezar un
+        # nivel y si cambia el tamaño de la ventana; dibujar después no escala nada.
+        tile_size = self.current_level.compute_layout(self.screen)[0]
+        self.level_images = self.sprites.tiles(LEVEL_TILES, tile_size)
+        self.level_images['level_background'] = self.assets.get('level_background')
+        self.player_images = {direction: self.sprites.get('player_' + direction, tile_size)
+                              for direction in PLAYER_DIRECTIONS}
+        self.sprite_screen_size = self.screen.get_size()
 
     def load_button_images(self):
         screen_width, _ = self.screen.get_size()
-        self.play_button = pygame.transform.scale(pygame.image.load("img_inicio/play_button.png"), (240, 140))
-        self.play_button_hover = pygame.transform.scale(pygame.image.load("img_inicio/play_button_hover.png"), (240, 140))
-        self.play_button_rect = self.play_button.get_rect(center=(screen_width // 2, 350))
+        self.assets.request('start', 'play_button', "img_inicio/play_button.png", (240, 140))
+        self.assets.request('start', 'play_button_hover', "img_inicio/play_button_hover.png", (240, 140))
+        self.play_button_rect = pygame.Rect(0, 0, 240, 140)
+        self.play_button_rect.center = (screen_width // 2, 350)
 
         button_size = (50, 50)
-        self.restart_button = pygame.transform.scale(pygame.image.load("img_buttons/restart.png"), button_size)
-        self.undo_button = pygame.transform.scale(pygame.image.load("img_buttons/undo.png"), button_size)
-        self.sound_button = pygame.transform.scale(pygame.image.load("img_buttons/sound_on.png"), button_size)
-        self.sound_off_button = pygame.transform.scale(pygame.image.load("img_buttons/sound_off.png"), button_size)
-        self.menu_button = pygame.transform.scale(pygame.image.load("img_buttons/menu.png"), button_size)
-        self.solve_button = pygame.transform.scale(pygame.image.load("img_buttons/solve.png"), button_size)
+        for name in ('restart', 'undo', 'sound_on', 'sound_off', 'menu', 'solve'):
+            self.assets.request('level', name + '_button', f"img_buttons/{name}.png", button_size)
+        for name, path in TILE_IMAGES.items():
+            self.sprites.load(name, path)
 
     def load_celebration_images(self):
-        self.celebration_images = []
         for i in range(10):
-            image = pygame.image.load(f"img_celebration/celebrate_{i+1}.png")
-            image = pygame.transform.scale(image, (100, 100))
-            self.celebration_images.append(image)
+            self.assets.request('celebration', f'celebrate_{i + 1}', f"img_celebration/celebrate_{i + 1}.png", (100, 100))
 
     def load_sublevel_buttons(self):
-        self.sublevel_buttons = []
         for i in range(1, 4):
-            level_buttons = []
             for j in range(1, 4):
-                button = pygame.image.load(f"img_buttons/sublevel_{i}_{j}.png")
-                button = pygame.transform.scale(button, (200, 100))
-                level_buttons.append(button)
-            self.sublevel_buttons.append(level_buttons)
-
-    def load_celebration_video(self):
-        self.celebration_video = cv2.VideoCapture("playita.mp4")
-        self.celebration_video_frames = []
-        screen_width, screen_height = self.screen.get_size()
-        while True:
-            ret, frame = self.celebration_video.read()
-            if not ret:
-                break
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame = cv2.resize(frame, (screen_width, screen_height))
-            frame = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-            self.celebration_video_frames.append(frame)
-        self.celebration_video.release()
+                self.assets.request('level_select', f'sublevel_{i}_{j}', f"img_buttons/sublevel_{i}_{j}.png", (200, 100))
 
     def run(self):
         while self.running:
+            if self.event_driven and not self.dirty:
+                event = pygame.event.wait(self.wait_timeout())
+                if event.type != pygame.NOEVENT:
+                    self.handle_event(event)
             self.handle_events()
             self.update()
-            self.draw()
-            self.clock.tick(60)
+            if self.dirty or not self.event_driven:
+                self.draw()
+                self.dirty = False
+                if self.first_frame_time is None:
+                    self.first_frame_time = time.perf_counter() - self.assets.started
+            if self.profile_startup and self.assets.idle():
+                self.print_startup_profile()
+                self.profile_startup = False
+            self.clock.tick(FRAME_RATE)
+        self.solver.cancel()
+        self.assets.shutdown()
+
+    def wait_timeout(self):
+        # Milisegundos que se puede esperar sin eventos antes de que haya algo que hacer.
+        if self.state == 'playing' and self.solution and self.solution_index < len(self.solution):
+            remaining = self.last_solution_move_time + self.solution_delay - time.time()
+            return max(1, int(remaining * 1000))
+            # `pygame.event.wait(0)` esperaría indefinidamente.
+        if self.solver.running:
+            return BUSY_TIMEOUT
+        return IDLE_TIMEOUT
+
+    def print_startup_profile(self):
+        print(f"Primer frame a los {self.first_frame_time:.3f} s")
+        for line in self.assets.report():
+            print(line)
 
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                self.handle_mouse_click(event.pos)
-            elif event.type == pygame.MOUSEMOTION:
-                self.handle_mouse_motion(event.pos)
-            elif event.type == pygame.KEYDOWN:
-                self.handle_key_press(event.key)
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.handle_mouse_click(event.pos)
+            self.dirty = True
+        elif event.type == pygame.MOUSEMOTION:
+            self.handle_mouse_motion(event.pos)
+        elif event.type == pygame.KEYDOWN:
+            self.handle_key_press(event.key)
+            self.dirty = True
+        elif event.type in EXPOSE_EVENTS:
+            self.drawn_level = None
+            self.dirty = True
 
     def handle_mouse_click(self, pos):
         if self.state == 'start':
@@ -156,6 +218,7 @@ class Game:
                 self.start_level(level)
         elif self.state == 'playing':
             if self.menu_rect.collidepoint(pos):
+                self.solver.cancel()
                 self.state = 'level_select'
                 self.level_select.reset_sublevel_selection()
             elif self.restart_rect.collidepoint(pos):
@@ -169,7 +232,11 @@ class Game:
 
     def handle_mouse_motion(self, pos):
         if self.state == 'start':
-            self.play_button_hovered = self.play_button_rect.collidepoint(pos)
+            hovered = bool(self.play_button_rect.collidepoint(pos))
+            if hovered != self.play_button_hovered:
+                self.play_button_hovered = hovered
+                self.dirty = True
+                # Solo cambiar el resaltado del botón obliga a redibujar.
 
     def handle_key_press(self, key):
         if self.state == 'playing':
@@ -183,6 +250,10 @@ class Game:
                 self.move_player(0, 1)
             elif key == pygame.K_r:
                 self.restart_level()
+            elif key == pygame.K_h:
+                self.show_hint()
+            elif key == pygame.K_ESCAPE and self.solver.running:
+                self.solver.cancel()
             elif key == pygame.K_ESCAPE:
                 self.state = 'level_select'
                 self.level_select.reset_sublevel_selection()
@@ -202,34 +273,42 @@ class Game:
                     self.start_level(level)
 
     def move_player(self, dx, dy):
+        self.solver.cancel()
         if self.current_level.move_player(self.player, dx, dy):
+            self.dirty = True
             self.steps += 1
-            self.moves_history.append((dx, dy))
+            self.moves_history.append((dx, dy, self.current_level.box_moved))
             if self.sound_enabled:
-                self.move_sound.play()
+                self.assets.get('move_sound').play()
                 if self.current_level.box_moved:
-                    self.box_sound.play()
+                    self.assets.get('box_sound').play()
 
     def undo_move(self):
+        self.solver.cancel()
         if self.moves_history:
-            last_move = self.moves_history.pop()
-            dx, dy = last_move
-
-            current_player_pos = (self.player.x, self.player.y)
-            previous_player_pos = (self.player.x - dx, self.player.y - dy)
-
-            potential_box_pos = (self.player.x + dx, self.player.y + dy)
-            if potential_box_pos in self.current_level.boxes:
-                self.current_level.boxes.remove(potential_box_pos)
-                self.current_level.boxes.append(current_player_pos)
-
-            self.player.move(-dx, -dy)
-            self.current_level.player_pos = previous_player_pos
-
+            dx, dy, box_moved = self.moves_history.pop()
+            self.current_level.undo_move(self.player, dx, dy, box_moved)
+            # Solo se arrastra la caja de vuelta si ese paso la empujó.
             self.steps -= 1
 
     def update(self):
+        if not self.music_started and self.assets.ready('background_music'):
+            self.music_started = True
+            if self.sound_enabled:
+                self.assets.get('background_music').play(-1)
         if self.state == 'playing':
+            if self.solver.running:
+                self.dirty = True
+                # El texto de progreso cambia mientras se busca.
+                done, solution = self.solver.poll()
+                if done:
+                    if solution:
+                        self.hints.learn(*self.solve_start, solution)
+                    self.receive_solution(solution)
+                    move = self.hints.next_move(self.current_level) if solution and not self.autoplay else None
+                    if move is not None:
+                        self.move_player(*move)
+                        # La pista pedida se da en cuanto llega el camino.
             if self.current_level.is_completed():
                 self.play_victory_sound()
                 self.level_select.mark_level_completed(self.current_level.level_number)
@@ -247,58 +326,95 @@ class Game:
                     self.last_solution_move_time = current_time
 
     def draw(self):
+        if self.state == 'playing':
+            self.draw_playing()
+            return
+        self.drawn_level = None
         self.screen.fill((0, 0, 0))
         if self.state == 'start':
             self.draw_start_screen()
         elif self.state == 'level_select':
             self.draw_level_select()
-        elif self.state == 'playing':
-            self.current_level.draw(self.screen, self.images)
-            if self.current_level.level_info:
-                self.player.draw(self.screen, self.current_level.level_info)
-            self.draw_game_ui()
         elif self.state == 'game_completed':
             self.draw_game_completed()
         pygame.display.flip()
 
+    def draw_playing(self):
+        # El nivel se dibuja sobre su capa estática cacheada: en cada frame solo se reponen y
+        # redibujan las cajas, el jugador y la interfaz, y solo esas zonas se envían a la pantalla.
+        level = self.current_level
+        if self.screen.get_size() != self.sprite_screen_size:
+            self.prepare_sprites()
+            self.player.images = self.player_images
+        full = self.drawn_level is not level
+        # Al entrar en un nivel (o volver de otra pantalla) se repinta todo.
+        full = level.prepare_static(self.screen, self.level_images) or full
+        rects = level.draw(self.screen, self.level_images, None if full else self.dirty_rects)
+        rects.append(self.player.draw(self.screen, level.level_info))
+        rects.extend(self.draw_game_ui())
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects + rects)
+            # Se actualizan las zonas de este frame y las del anterior, que ahora muestran el fondo.
+        self.dirty_rects = rects
+        self.drawn_level = level
+
     def draw_start_screen(self):
-        self.screen.blit(self.images['background'], (0, 0))
+        self.screen.blit(self.assets.get('background'), (0, 0))
         if self.play_button_hovered:
-            self.screen.blit(self.play_button_hover, self.play_button_rect)
+            self.screen.blit(self.assets.get('play_button_hover'), self.play_button_rect)
         else:
-            self.screen.blit(self.play_button, self.play_button_rect)
+            self.screen.blit(self.assets.get('play_button'), self.play_button_rect)
 
     def draw_level_select(self):
         if self.level_select.selected_sublevel is None:
-            self.screen.blit(self.images['level_select_background'], (0, 0))
+            self.screen.blit(self.assets.get('level_select_background'), (0, 0))
         else:
-            self.screen.blit(self.images['sublevel_select_background'], (0, 0))
-        self.level_select.draw(self.screen, self.level_blocks, self.sublevel_buttons)
+            self.screen.blit(self.assets.get('sublevel_select_background'), (0, 0))
+        level_blocks = [self.assets.get(f'level_block_{i + 1}') for i in range(3)]
+        sublevel_buttons = [[self.assets.get(f'sublevel_{i}_{j}') for j in range(1, 4)] for i in range(1, 4)]
+        self.level_select.draw(self.screen, level_blocks, sublevel_buttons)
 
     def draw_game_ui(self):
-        level_text = self.font.render(f"Nivel: {self.current_level.level_number}", True, (255, 255, 255))
-        self.screen.blit(level_text, (20, 20))
+        # Dibuja textos y botones; devuelve los rectángulos ocupados.
+        level_text = self.texts.render(self.font, f"Nivel: {self.current_level.level_number}", (255, 255, 255))
+        # Con la caché, los textos solo se vuelven a renderizar cuando cambia el nivel o los pasos.
+        rects = [self.screen.blit(level_text, (20, 20))]
         
-        steps_text = self.font.render(f"Pasos: {self.steps}", True, (255, 255, 255))
-        self.screen.blit(steps_text, (20, 60))
+        steps_text = self.texts.render(self.font, f"Pasos: {self.steps}", (255, 255, 255))
+        rects.append(self.screen.blit(steps_text, (20, 60)))
 
         screen_width, screen_height = self.screen.get_size()
         button_y = screen_height - 60
         
-        self.menu_rect = self.screen.blit(self.menu_button, (screen_width - 300, button_y))
-        self.restart_rect = self.screen.blit(self.restart_button, (screen_width - 240, button_y))
-        self.undo_rect = self.screen.blit(self.undo_button, (screen_width - 180, button_y))
-        self.solve_rect = self.screen.blit(self.solve_button, (screen_width - 120, button_y))
+        self.menu_rect = self.screen.blit(self.assets.get('menu_button'), (screen_width - 300, button_y))
+        self.restart_rect = self.screen.blit(self.assets.get('restart_button'), (screen_width - 240, button_y))
+        self.undo_rect = self.screen.blit(self.assets.get('undo_button'), (screen_width - 180, button_y))
+        self.solve_rect = self.screen.blit(self.assets.get('solve_button'), (screen_width - 120, button_y))
         
         if self.sound_enabled:
-            self.sound_rect = self.screen.blit(self.sound_button, (screen_width - 60, button_y))
+            self.sound_rect = self.screen.blit(self.assets.get('sound_on_button'), (screen_width - 60, button_y))
         else:
-            self.sound_rect = self.screen.blit(self.sound_off_button, (screen_width - 60, button_y))
+            self.sound_rect = self.screen.blit(self.assets.get('sound_off_button'), (screen_width - 60, button_y))
+        rects.extend([self.menu_rect, self.restart_rect, self.undo_rect, self.solve_rect, self.sound_rect])
+
+        if self.solver.running:
+            progress_text = self.texts.render(
+                self.font, f"Resolviendo: {self.solver.nodes} nodos, {self.solver.elapsed:.1f} s", (255, 255, 255))
+            rects.append(self.screen.blit(progress_text, (20, 100)))
+        return rects
 
     def start_level(self, level_data):
+        self.solver.cancel()
         self.current_level = Level(level_data)
-        self.player = Player(self.current_level.player_start)
+        self.prepare_sprites()
+        self.player = Player(self.current_level.player_start, self.player_images)
+        if self.hints.solver is None or self.hints.level_data is not level_data:
+            self.hints.reset(self.current_level)
+            # Al reiniciar el mismo nivel se conservan las soluciones aprendidas.
         self.state = 'playing'
+        self.dirty = True
         self.steps = 0
         self.moves_history = []
         self.solution = None
@@ -310,21 +426,42 @@ class Game:
     def toggle_sound(self):
         self.sound_enabled = not self.sound_enabled
         if self.sound_enabled:
-            self.background_music.play(-1)
+            self.assets.get('background_music').play(-1)
+            self.music_started = True
+        else:
+            self.assets.get('background_music').stop()
+
+    def solve_level(self, autoplay=True):
+        if self.solver.running:
+            return
+        self.solution = None
+        self.autoplay = autoplay
+        self.solve_start = (list(self.current_level.boxes), tuple(self.current_level.player_pos))
+        self.solver.start(self.current_level, self.hints.known_states())
+        # La búsqueda corre en segundo plano; `update` recoge el resultado sin bloquear el bucle.
+        # Desde un estado conocido (o cercano a uno) el proceso responde sin búsqueda completa.
+
+    def show_hint(self):
+        # Da el siguiente paso recomendado; si aún no hay ninguna solución conocida, la busca.
+        if self.solver.running:
+            return
+        move = self.hints.next_move(self.current_level)
+        if move is not None:
+            self.move_player(*move)
         else:
-            self.background_music.stop()
+            self.solve_level(autoplay=False)
 
-    def solve_level(self):
-        self.solution = self.solver.solve(self.current_level)
+    def receive_solution(self, solution):
+        self.solution = solution if self.autoplay else None
         self.solution_index = 0
         self.last_solution_move_time = time.time()
-        if not self.solution:
+        if not solution:
             print("No se pudo encontrar una solución.")
 
     def play_victory_sound(self):
-        if self.sound_enabled and self.victory_sound:
+        if self.sound_enabled:
             try:
-                self.victory_sound.play()
+                self.assets.get('victory_sound').play()
             except pygame.error:
                 print("Error al reproducir el sonido de victoria")
 
@@ -335,7 +472,10 @@ class Game:
 
         start_time = pygame.time.get_ticks()
         if self.sound_enabled:
-            self.celebration_sound.play()
+            self.assets.get('celebration_sound').play()
+        video = VideoStream("playita.mp4", self.screen.get_size())
+        video.start()
+        # El vídeo se decodifica en segundo plano mientras dura la celebración.
 
         for frame in range(total_frames):
             for event in pygame.event.get():
@@ -343,27 +483,39 @@ class Game:
                     pygame.quit()
                     return
 
-            self.screen.blit(self.images['level_background'], (0, 0))
-            
-            self.current_level.draw(self.screen, self.images)
+            self.current_level.draw(self.screen, self.level_images)
             
-            video_frame_index = frame % len(self.celebration_video_frames)
-            video_frame = self.celebration_video_frames[video_frame_index]
-            
-            self.screen.blit(video_frame, (0, 0))
+            video_frame = video.next_frame()
+            if video_frame is not None:
+                self.screen.blit(video_frame, (0, 0))
+                # Sin OpenCV o sin el archivo, la celebración se muestra sin vídeo.
 
             pygame.display.flip()
             self.clock.tick(frames_per_second)
 
+        video.stop()
         if self.sound_enabled:
-            self.celebration_sound.stop()
+            self.assets.get('celebration_sound').stop()
+        self.drawn_level = None
+        self.dirty = True
+        # El vídeo ha tapado toda la pantalla: el siguiente frame se repinta entero.
 
     def draw_game_completed(self):
         self.screen.fill((0, 0, 0))
-        text = self.font.render("¡Felicidades! Has completado todos los niveles", True, (255, 255, 255))
+        text = self.texts.render(self.font, "¡Felicidades! Has completado todos los niveles", (255, 255, 255))
         text_rect = text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2))
         self.screen.blit(text, text_rect)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sokoban - UVP")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="imprime el tiempo de carga por grupo de recursos")
+    parser.add_argument('--continuous-redraw', action='store_true',
+                        help="redibuja a 60 FPS aunque no cambie nada, en lugar de esperar eventos")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    game = Game()
+    multiprocessing.freeze_support()
+    args = parse_args()
+    game = Game(profile_startup=args.profile_startup, event_driven=not args.continuous_redraw)
     game.run()
\ No newline at end of file
@@ -0,0 +1,119 @@
+from collections import deque
+# se usa para el BFS de distancias de empuje.
+
+INF = 10 ** 6
+# Coste de una caja que no puede llegar a un objetivo; cualquier suma >= INF es un bloqueo.
+
+
+class AssignmentHeuristic:
+    def __init__(self, board):
+        # Precalcula, una vez por nivel, la distancia de empuje de cada celda a cada objetivo.
+        self.board = board
+        self.targets = list(board.targets)
+        distances = [self.push_distances(target) for target in self.targets]
+        self.costs = [tuple(row[cell] for row in distances) for cell in range(board.size)]
+        # costs[celda][j] = empujes mínimos para llevar una caja de la celda al objetivo j.
+
+    def push_distances(self, target):
+        # BFS "tirando" de una caja desde el objetivo: respeta paredes pero ignora otras cajas,
+        # así que nunca sobreestima el número de empujes (heurística admisible).
+        moves = self.board.moves
+        distance = [INF] * self.board.size
+        distance[target] = 0
+        queue = deque([target])
+        while queue:
+            cell = queue.popleft()
+            for direction in range(4):
+                box_cell = moves[cell][direction]
+                if box_cell < 0 or distance[box_cell] != INF or moves[box_cell][direction] < 0:
+                    continue
+                    # Para tirar hasta box_cell el jugador necesita pisar box_cell y la celda siguiente.
+                distance[box_cell] = distance[cell] + 1
+                queue.append(box_cell)
+        return distance
+
+    def evaluate(self, boxes):
+        # Emparejamiento de coste mínimo cajas-objetivos (algoritmo húngaro con potenciales).
+        # Devuelve el valor y un contexto reutilizable por `update`.
+        rows = list(boxes)
+        n, m = len(rows), len(self.targets)
+        if n > m:
+            return INF, None
+        u = [0] * (n + 1)
+        v = [0] * (m + 1)
+        owner = [0] * (m + 1)
+        # owner[j] es la fila (1..n) asignada a la columna j; 0 si está libre.
+        for row in range(1, n + 1):
+            self.augment(rows, row, u, v, owner)
+        context = (rows, u, v, owner)
+        return self.total(context), context
+
+    def update(self, context, old_cell, new_cell):
+        # Recalcula el emparejamiento cuando solo una caja se ha movido: se libera su fila,
+        # se le asigna el nuevo coste y se busca un único camino aumentante (O(n·m)).
+        rows, u, v, owner = context
+        if len(rows) < len(self.targets):
+            return self.evaluate([new_cell if cell == old_cell else cell for cell in rows])
+            # Con objetivos sobrantes una columna liberada rompe la holgura complementaria:
+            # se recalcula completo para no sobreestimar.
+        rows = list(rows)
+        u = list(u)
+        v = list(v)
+        owner = list(owner)
+        row = rows.index(old_cell) + 1
+        rows[row - 1] = new_cell
+        for column in range(1, len(owner)):
+            if owner[column] == row:
+                owner[column] = 0
+                break
+        u[row] = 0
+        # Con v <= 0 y costes >= 0, u = 0 mantiene factibles los potenciales de la fila.
+        self.augment(rows, row, u, v, owner)
+        context = (rows, u, v, owner)
+        return self.total(context), context
+
+    def augment(self, rows, row, u, v, owner):
+        # Añade la fila `row` al emparejamiento por el camino aumentante más corto.
+        m = len(owner) - 1
+        minv = [INF * INF] * (m + 1)
+        used = [False] * (m + 1)
+        way = [0] * (m + 1)
+        owner[0] = row
+        column = 0
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            costs = self.costs[rows[current_row - 1]]
+            delta = INF * INF
+            next_column = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    reduced = costs[j - 1] - u[current_row] - v[j]
+                    if reduced < minv[j]:
+                        minv[j] = reduced
+                        way[j] = column
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        next_column = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    def total(self, context):
+        # Suma de los costes de las parejas caja-objetivo elegidas.
+        rows, _, _, owner = context
+        value = 0
+        for column in range(1, len(owner)):
+            if owner[column]:
+                value += self.costs[rows[owner[column] - 1]][column - 1]
+        return min(value, INF)
@@ -0,0 +1,119 @@
+from backward_table import BackwardTable
+from board import DIRECTIONS
+from solver import Solver
+from solver_stats import SolverStats
+
+REPAIR_NODES = 500
+# Expansiones máximas de la búsqueda local que reconecta el estado actual con un camino conocido.
+
+
+class HintEngine:
+    def __init__(self, repair_nodes=REPAIR_NODES):
+        # Pistas de "siguiente mejor movimiento" que sobreviven a los movimientos del jugador.
+        # Guarda, para cada estado de las soluciones ya vistas, los empujes que faltan y el
+        # siguiente empuje. Seguir un camino conocido o deshacer hasta uno responde al instante;
+        # si el jugador se desvía, una búsqueda local acotada vuelve a enlazar con lo conocido.
+        self.repair_nodes = repair_nodes
+        self.solver = None
+        self.known = None
+        self.level_data = None
+
+    def reset(self, level):
+        # Compila un nivel nuevo y olvida lo aprendido del anterior.
+        self.level_data = level.level_data
+        self.solver = Solver(mode='push', node_limit=self.repair_nodes)
+        if self.solver.prepare(level) is None:
+            self.solver = None
+            self.known = None
+            return
+            # Nivel sin solución: no hay pistas.
+        board = self.solver.board
+        self.known = BackwardTable(board, len(level.boxes))
+        # Misma estructura que la búsqueda hacia atrás: distancia y siguiente empuje por estado.
+
+    def state(self, boxes, player_pos):
+        board = self.solver.board
+        box_bits = board.pack_boxes(boxes)
+        player = board.index[tuple(player_pos)]
+        _, canonical = board.reachable(player, box_bits)
+        return box_bits, player, board.key(box_bits, canonical)
+
+    def learn(self, boxes, player_pos, steps):
+        # Incorpora una solución (lista de pasos) que parte de las cajas y el jugador indicados.
+        if self.solver is None:
+            return
+        board = self.solver.board
+        box_bits, player, key = self.state(boxes, player_pos)
+        pushes = []
+        for step in steps:
+            direction = DIRECTIONS.index(tuple(step))
+            cell = board.moves[player][direction]
+            if box_bits >> cell & 1:
+                pushes.append((key, cell, direction))
+                box_bits ^= (1 << cell) ^ (1 << board.moves[cell][direction])
+                _, canonical = board.reachable(cell, box_bits)
+                key = board.key(box_bits, canonical)
+            player = cell
+        if not self.solver.is_goal(key):
+            return
+        distance = self.known.distance
+        next_push = self.known.next_push
+        if key not in distance:
+            distance[key] = 0
+            next_push[key] = None
+        remaining = distance[key]
+        for state, box, direction in reversed(pushes):
+            remaining += 1
+            if state not in distance or remaining < distance[state]:
+                distance[state] = remaining
+                next_push[state] = (key, box, direction)
+            remaining = distance[state]
+            key = state
+            # Si el estado ya tenía un camino más corto se conserva y se sigue desde él.
+
+    def repair(self, box_bits, player):
+        # A* acotado desde el estado actual que termina al alcanzar cualquier estado conocido.
+        solver = self.solver
+        solver.stats = SolverStats()
+        solver.backward = self.known
+        steps = solver.solve_pushes(box_bits, player)
+        solver.backward = None
+        return steps
+
+    def plan(self, level):
+        # Pasos desde el estado actual hasta el final, o None si no se conoce ni se puede reparar
+        # dentro del límite (entonces hace falta una búsqueda completa).
+        if self.solver is None:
+            return None
+        box_bits, player, key = self.state(level.boxes, level.player_pos)
+        if key in self.known.distance:
+            return self.solver.pushes_to_steps(self.known.pushes_from(key), player, box_bits)
+        steps = self.repair(box_bits, player)
+        if steps is not None:
+            self.learn(level.boxes, level.player_pos, steps)
+        return steps
+
+    def known_states(self):
+        # Distancias y siguientes empujes aprendidos, para enviarlos al proceso de `BackgroundSolver`;
+        # None si no hay ninguno.
+        if self.solver is None or not self.known.distance:
+            return None
+        return self.known.distance, self.known.next_push
+
+    def next_move(self, level):
+        # Siguiente paso (dx, dy) recomendado desde un estado ya conocido, o None si no hay pista.
+        # No busca: `plan` (con la reparación) corre en el proceso de `BackgroundSolver` para no
+        # bloquear el bucle del juego.
+        if self.solver is None:
+            return None
+        board = self.solver.board
+        box_bits, player, key = self.state(level.boxes, level.player_pos)
+        if key not in self.known.distance:
+            return None
+        push = self.known.next_push[key]
+        if push is None:
+            return None
+            # El nivel ya está resuelto.
+        _, box, direction = push
+        walk = board.walk(player, board.moves[box][direction ^ 2], box_bits)
+        return walk[0] if walk else DIRECTIONS[direction]
@@ -1,4 +1,9 @@
 import pygame
+from array import array
+
+WALL = 1
+TARGET = 2
+# Banderas de tipo de celda en la rejilla del nivel.
 
 class Level:
     def __init__(self, level_data):
@@ -13,6 +18,38 @@ class Level:
         self.walls = self.find_walls()
         self.box_moved = False
         self.level_info = None
+        self.static_layer = None
+        self.static_key = None
+        # Capa estática (fondo, paredes y objetivos) cacheada por tamaño de pantalla.
+        self.build_grid()
+        # Las listas se conservan para el solver; el juego consulta la rejilla en O(1).
+
+    def build_grid(self):
+        # Rejilla plana de ancho x alto: banderas de tipo por celda, la caja que ocupa cada celda
+        # (índice en `self.boxes`, o -1) y un contador de cajas sobre objetivo.
+        self.width = max((len(row) for row in self.layout), default=0)
+        self.height = len(self.layout)
+        self.grid = bytearray(self.width * self.height)
+        for x, y in self.walls:
+            self.grid[y * self.width + x] |= WALL
+        for x, y in self.targets:
+            self.grid[y * self.width + x] |= TARGET
+        self.box_at = array('i', [-1]) * (self.width * self.height)
+        self.on_target = 0
+        for i, (x, y) in enumerate(self.boxes):
+            cell = y * self.width + x
+            self.box_at[cell] = i
+            if self.grid[cell] & TARGET:
+                self.on_target += 1
+
+    def cell_index(self, x, y):
+        # Posición de (x, y) en la rejilla, o -1 si queda fuera (se trata como pared).
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+    def is_free(self, cell):
+        return cell >= 0 and not self.grid[cell] & WALL and self.box_at[cell] < 0
 
     def find_player_start(self):
         # Busca la posición inicial del jugador en el layout
@@ -55,16 +92,16 @@ class Level:
         self.box_moved = False  # Reinicia el indicador de movimiento de caja
 
         # Verifica si la nueva posición es una pared
-        if (new_x, new_y) in self.walls:
+        cell = self.cell_index(new_x, new_y)
+        if cell < 0 or self.grid[cell] & WALL:
             return False # No se permite el movimiento si hay una pared
 
         # Verifica si hay una caja en la nueva posición y si se puede mover
-        if (new_x, new_y) in self.boxes:
-            new_box_x, new_box_y = new_x + dx, new_y + dy
+        if self.box_at[cell] >= 0:
+            beyond = self.cell_index(new_x + dx, new_y + dy)
              # Verifica si la caja puede moverse (no debe chocar con paredes ni otras cajas)
-            if (new_box_x, new_box_y) not in self.walls and (new_box_x, new_box_y) not in self.boxes:
-                self.boxes.remove((new_x, new_y)) # Elimina la caja de su posición actual
-                self.boxes.append((new_box_x, new_box_y)) # Añade la caja en su nueva posición
+            if self.is_free(beyond):
+                self.move_box(cell, beyond) # Mueve la caja a su nueva posición
                 self.box_moved = True  # Indica que una caja fue movida
             else:
                  # Si la caja no puede moverse, el movimiento del jugador también es inválido
@@ -75,35 +112,76 @@ class Level:
         self.player_pos = (player.x, player.y) # Actualiza la posición del jugador en el nivel
         return True # Retorna True indicando que el movimiento fue exitoso
 
+    def undo_move(self, player, dx, dy, box_moved):
+        # Deshace un paso (dx, dy); si empujó una caja, la devuelve a la celda del jugador.
+        if box_moved:
+            self.move_box(self.cell_index(player.x + dx, player.y + dy), self.cell_index(player.x, player.y))
+        player.move(-dx, -dy)
+        self.player_pos = (player.x, player.y)
+
+    def move_box(self, old, new):
+        # Mueve la caja de la celda `old` a `new`, actualizando su entrada en `self.boxes` y el contador.
+        box = self.box_at[old]
+        self.box_at[old] = -1
+        self.box_at[new] = box
+        self.boxes[box] = (new % self.width, new // self.width)
+        if self.grid[old] & TARGET:
+            self.on_target -= 1
+        if self.grid[new] & TARGET:
+            self.on_target += 1
+
     def is_completed(self):
         # Verifica si todas las cajas están en los objetivos
-        return all(box in self.targets for box in self.boxes)
+        return self.on_target == len(self.boxes)
 
-    def draw(self, screen, images):
-        # Dibuja el nivel en la pantalla
+    def compute_layout(self, screen):
+        # Calcula el tamaño de los tiles y el offset para centrar el nivel en la pantalla.
         screen_width, screen_height = screen.get_size()
         level_width = len(self.layout[0])
         level_height = len(self.layout)
-        
-        # Calcula el tamaño de los tiles y el offset para centrar el nivel
         tile_size = min(screen_width // (level_width + 2), screen_height // (level_height + 2))
         offset_x = (screen_width - tile_size * level_width) // 2
         offset_y = (screen_height - tile_size * level_height) // 2
-
         self.level_info = (tile_size, offset_x, offset_y)
+        return self.level_info
+
+    def prepare_static(self, screen, images):
+        # Pre-renderiza fondo, paredes y objetivos en una superficie, una vez por tamaño de
+        # pantalla y juego de imágenes. Devuelve True si se ha (re)construido.
+        key = (screen.get_size(), id(images))
+        if self.static_layer is not None and self.static_key == key:
+            return False
+        tile_size, offset_x, offset_y = self.compute_layout(screen)
 
         # Dibuja el fondo del nivel
-        screen.blit(images['level_background'], (0, 0))
+        layer = pygame.Surface(screen.get_size()).convert()
+        layer.blit(images['level_background'], (0, 0))
 
         # Dibuja las paredes y los objetivos
         for y, row in enumerate(self.layout):
             for x, cell in enumerate(row):
                 pos = (offset_x + x * tile_size, offset_y + y * tile_size)
                 if cell == '#':
-                    screen.blit(images['stone_wall'], pos)
+                    layer.blit(images['stone_wall'], pos)
                 elif cell == '.':
-                    screen.blit(images['crystal'], pos)
-        
+                    layer.blit(images['crystal'], pos)
+        self.static_layer = layer
+        self.static_key = key
+        return True
+
+    def draw(self, screen, images, restore=None):
+        # Dibuja el nivel en la pantalla. Con `restore`, solo se repone la capa estática bajo esos
+        # rectángulos (lo dibujado en el frame anterior); si no, se copia entera.
+        # Devuelve los rectángulos de las cajas dibujadas.
+        if self.prepare_static(screen, images):
+            restore = None
+        if restore is None:
+            screen.blit(self.static_layer, (0, 0))
+        else:
+            for rect in restore:
+                screen.blit(self.static_layer, rect, rect)
+
         # Dibuja las cajas
-        for box in self.boxes:
-            screen.blit(images['wooden_box'], (offset_x + box[0] * tile_size, offset_y + box[1] * tile_size))
\ No newline at end of file
+        tile_size, offset_x, offset_y = self.level_info
+        box_image = images['wooden_box']
+        return [screen.blit(box_image, (offset_x + x * tile_size, offset_y + y * tile_size)) for x, y in self.boxes]
@@ -0,0 +1,120 @@
+import os
+
+LEVEL_CHARS = set("#@+$*.-_ ")
+# Caracteres válidos en una fila de nivel en formato XSB.
+PACK_EXTENSIONS = ('.xsb', '.sok', '.txt')
+MOVE_LETTERS = {(0, -1): 'u', (0, 1): 'd', (-1, 0): 'l', (1, 0): 'r'}
+# Notación LURD: minúscula para un paso, mayúscula para un empuje.
+
+
+def load_levels(path):
+    # Carga los niveles de un archivo XSB o de todos los archivos de colección de un directorio.
+    # Cada nivel tiene el mismo formato que los de `LevelSelect`: número, nombre y layout.
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                       if name.lower().endswith(PACK_EXTENSIONS))
+    else:
+        files = [path]
+    levels = []
+    for file_path in files:
+        with open(file_path, encoding='utf-8') as pack:
+            levels.extend(parse_xsb(pack.read(), os.path.splitext(os.path.basename(file_path))[0]))
+    return levels
+
+
+def parse_xsb(text, pack_name):
+    # Separa una colección XSB en niveles; los comentarios (';' o 'Title:') dan el nombre.
+    levels = []
+    rows = []
+    title = None
+    for line in text.splitlines() + ['']:
+        line = line.rstrip('\r\n')
+        is_row = line.strip() and '#' in line and set(line) <= LEVEL_CHARS
+        if is_row:
+            rows.append(line.replace('-', ' ').replace('_', ' '))
+            continue
+        if rows:
+            number = len(levels) + 1
+            width = max(len(row) for row in rows)
+            levels.append({
+                'number': number,
+                'name': title or f"{pack_name} #{number}",
+                'pack': pack_name,
+                'layout': [list(row.ljust(width)) for row in rows],
+            })
+            rows = []
+            title = None
+        stripped = line.strip()
+        if stripped.startswith(';'):
+            title = stripped.lstrip(';').strip() or title
+        elif stripped.lower().startswith('title:'):
+            title = stripped[6:].strip() or title
+    return levels
+
+
+class HeadlessLevel:
+    # Nivel sin pygame con los mismos atributos que `Level`, para resolver fuera del juego.
+    def __init__(self, level_data):
+        self.level_data = level_data
+        self.layout = level_data['layout']
+        self.level_number = level_data['number']
+        self.walls = []
+        self.boxes = []
+        self.targets = []
+        self.player_start = (1, 1)
+        for y, row in enumerate(self.layout):
+            for x, cell in enumerate(row):
+                if cell == '#':
+                    self.walls.append((x, y))
+                if cell in '$*':
+                    self.boxes.append((x, y))
+                if cell in '.*+':
+                    self.targets.append((x, y))
+                if cell in '@+':
+                    self.player_start = (x, y)
+        self.player_pos = self.player_start
+
+    @classmethod
+    def snapshot(cls, level):
+        # Copia el estado actual de un `Level` (cajas y jugador) en un objeto que se puede
+        # enviar a otro proceso sin arrastrar superficies de pygame.
+        headless = cls(level.level_data)
+        headless.boxes = list(level.boxes)
+        headless.player_pos = tuple(level.player_pos)
+        return headless
+
+    def move_player(self, dx, dy):
+        # Aplica un paso; devuelve None si es inválido, o si empujó una caja.
+        x, y = self.player_pos
+        new_pos = (x + dx, y + dy)
+        if new_pos in self.walls:
+            return None
+        pushed = new_pos in self.boxes
+        if pushed:
+            box_pos = (x + 2 * dx, y + 2 * dy)
+            if box_pos in self.walls or box_pos in self.boxes:
+                return None
+            self.boxes.remove(new_pos)
+            self.boxes.append(box_pos)
+        self.player_pos = new_pos
+        return pushed
+
+    def is_completed(self):
+        return all(box in self.targets for box in self.boxes)
+
+
+def encode_lurd(level_data, steps):
+    # Convierte una lista de pasos (dx, dy) en notación LURD reproduciéndola sobre el nivel.
+    level = HeadlessLevel(level_data)
+    letters = []
+    for dx, dy in steps:
+        pushed = level.move_player(dx, dy)
+        letter = MOVE_LETTERS[(dx, dy)]
+        letters.append(letter.upper() if pushed else letter)
+    return ''.join(letters)
+
+
+def decode_lurd(moves):
+    # Operación inversa: de notación LURD a la lista de pasos que reproduce `Game.update`.
+    directions = {letter: step for step, letter in MOVE_LETTERS.items()}
+    return [directions[letter.lower()] for letter in moves]
@@ -1,7 +1,8 @@
 import pygame
+from builtin_levels import BUILTIN_LEVELS
 
 class LevelSelect:
-    def __init__(self):
+    def __init__(self, assets=None, texts=None):
         self.levels = [
             {'number': 1, 'name': 'Nivel I', 'sublevels': [
                 {'number': 1, 'name': 'Nivel I - 1', 'layout': self.load_level(1)},
@@ -23,121 +24,23 @@ class LevelSelect:
         self.selected_level = 0
         self.selected_sublevel = None
         self.current_selection = 0
-        self.load_images()
+        self.assets = assets
+        self.texts = texts
+        # `AssetManager` y `TextCache` compartidos con `Game`; sin ellos (uso sin interfaz) no se
+        # cargan imágenes ni fuentes.
+        if assets is not None:
+            self.load_images()
+            self.font = pygame.font.Font(None, 36)
+            # La fuente se crea una sola vez, no en cada frame.
 
     def load_images(self):
-        self.checkmark = pygame.image.load("img_buttons/checkmark.png")
-        self.cross = pygame.image.load("img_buttons/cross.png")
-        self.checkmark = pygame.transform.scale(self.checkmark, (30, 30))
-        self.cross = pygame.transform.scale(self.cross, (30, 30))
-        self.back_button = pygame.image.load("img_buttons/back_button.png")
-        self.back_button = pygame.transform.scale(self.back_button, (50, 50))
-        self.beach_ball = pygame.image.load("img_buttons/beach_ball.png")
-        self.beach_ball = pygame.transform.scale(self.beach_ball, (40, 40))
+        self.assets.request('level_select', 'checkmark', "img_buttons/checkmark.png", (30, 30))
+        self.assets.request('level_select', 'cross', "img_buttons/cross.png", (30, 30))
+        self.assets.request('level_select', 'back_button', "img_buttons/back_button.png", (50, 50))
+        self.assets.request('level_select', 'beach_ball', "img_buttons/beach_ball.png", (40, 40))
 
     def load_level(self, level_number):
-        levels = {
-            # Nivel I
-            
-            1: [
-                "#######",
-                "#     #",
-                "#     #",
-                "#  $  #",
-                "#  .  #",
-                "#  @  #",
-                "#######"
-            ],
-            
-            2: [
-                "########",
-                "#      #",
-                "#  $   #",
-                "#     ##",
-                "#  @   #",
-                "#     ##",
-                "#  .   #",
-                "########"
-            ],
-            
-            3: [
-                "#########",
-                "#       #",
-                "#   @   #",
-                "# $     #",
-                "#####  ##",
-                "#   #   #",
-                "#   .   #",
-                "#       #",
-                "#########"
-            ],
-            # Nivel II
-            # 1
-            4: [
-                "########",
-                "#   .. #",
-                "#  @$$ #",
-                "##### ##",
-                "#      #",
-                "#      #",
-                "#      #",
-                "########"
-            ],
-            # 15
-            5: [
-                "####    ",
-                "#  #### ",
-                "#     # ",
-                "#     # ",
-                "### ### ",
-                "# $$  ##",
-                "# . .@ #",
-                "####   #",
-                "   #####"
-            ],
-            # 28
-            6: [
-                "  #### ",
-                "  #  # ",
-                "###  # ",
-                "#  $$##",
-                "# . . #",
-                "###  @#",
-                "  #####"
-            ],
-            # Nivel III
-            # 150
-            7: [
-                "#####  ",
-                "#.  ###",
-                "# # $@#",
-                "# . # #",
-                "#  .$ #",
-                "##$ ###",
-                " #  #  ",
-                " ####  "
-            ],
-            # 203
-            8: [
-                "####  ",
-                "#  ###",
-                "# $$ #",
-                "#... #",
-                "# @$ #",
-                "#   ##",
-                "##### "
-            ],
-            # 182
-            9: [
-                " #######",
-                " #     #",
-                " # .$. #",
-                "## $@$ #",
-                "#  .$. #",
-                "#      #",
-                "########"
-            ]
-        }
+        levels = BUILTIN_LEVELS
         
         if level_number in levels: # Verifica si el nivel solicitado (level_number) está en la colección de niveles predefinidos (levels).
             return [list(row) for row in levels[level_number]] # Si existe, convierte cada fila del nivel en una lista y lo retorna.
@@ -174,14 +77,14 @@ class LevelSelect:
 
             completed_levels = sum(1 for sublevel in self.levels[i]['sublevels'] if sublevel['number'] in self.completed_levels)
              # Calcula cuántos subniveles de este nivel han sido completados.
-            completed_text = pygame.font.Font(None, 36).render(f"{completed_levels}/3", True, (255, 255, 255))
+            completed_text = self.texts.render(self.font, f"{completed_levels}/3", (255, 255, 255))
             completed_rect = completed_text.get_rect(center=(block_rect.centerx, block_rect.bottom + 30))
             screen.blit(completed_text, completed_rect)
 
             if i == self.current_selection:
                 # Ajustamos la posición de la pelotita de playa para cada nivel
                 ball_pos = (block_rect.left - -45, block_rect.centery - 20)
-                screen.blit(self.beach_ball, ball_pos)
+                screen.blit(self.assets.get('beach_ball'), ball_pos)
 
     def draw_sublevels(self, screen, sublevel_buttons):
         screen_width, screen_height = screen.get_size()
@@ -193,16 +96,16 @@ class LevelSelect:
             screen.blit(button, button_rect)
 
             if sublevel['number'] in self.completed_levels:
-                screen.blit(self.checkmark, (button_rect.right + 10, button_rect.centery - 15))
+                screen.blit(self.assets.get('checkmark'), (button_rect.right + 10, button_rect.centery - 15))
             else:
-                screen.blit(self.cross, (button_rect.right + 10, button_rect.centery - 15))
+                screen.blit(self.assets.get('cross'), (button_rect.right + 10, button_rect.centery - 15))
 
             if i == self.current_selection:
                 ball_pos = (button_rect.left - 50, button_rect.centery - 20)
-                screen.blit(self.beach_ball, ball_pos)
+                screen.blit(self.assets.get('beach_ball'), ball_pos)
 
-        back_button_rect = self.back_button.get_rect(topleft=(20, 20))
-        screen.blit(self.back_button, back_button_rect)
+        back_button = self.assets.get('back_button')
+        screen.blit(back_button, back_button.get_rect(topleft=(20, 20)))
 
     def handle_click(self, pos):
         if self.selected_sublevel is None:
@@ -0,0 +1,186 @@
+from collections import deque
+
+MAX_ROOM_TARGETS = 16
+# Salas con más objetivos no se analizan: el orden de llenado sería demasiado caro de buscar.
+
+
+class MacroMoves:
+    def __init__(self, board, deadlocks, start_boxes, start_player):
+        # Macro-movimientos del solver: varios empujes de una misma caja que cuentan como una
+        # sola arista. Túneles: en un pasillo de ancho 1 solo tiene sentido seguir empujando.
+        # Sala de objetivos: si todos los objetivos están tras una única entrada, cada caja que
+        # entra se lleva directamente al siguiente objetivo de un orden de llenado precalculado.
+        self.board = board
+        self.deadlocks = deadlocks
+        self.room_bits = 0
+        self.entrance = -1
+        self.outside = -1
+        self.order = []
+        self.prefixes = []
+        # prefixes[k] = bitboard de los k primeros objetivos del orden de llenado.
+        self.paths = {}
+        # paths[k] = empujes que llevan una caja de la entrada al objetivo order[k].
+        self.find_goal_room(start_boxes, start_player)
+
+    def is_tunnel(self, cell, direction):
+        # Celda con paredes a ambos lados respecto al eje de `direction`.
+        moves = self.board.moves[cell]
+        return moves[direction ^ 1] < 0 and moves[direction ^ 3] < 0
+
+    def extend(self, box, direction, new_boxes):
+        # Completa el empuje de `box` en `direction`. Devuelve (empujes, cajas finales), donde
+        # empujes es una tupla de (caja, dirección) que empieza por el empuje original.
+        moves = self.board.moves
+        cell = moves[box][direction]
+        if self.order and cell == self.entrance and box == self.outside:
+            filled = new_boxes & self.room_bits
+            if filled in self.prefixes:
+                k = self.prefixes.index(filled)
+                target = self.order[k]
+                return ((box, direction),) + self.paths[k], new_boxes ^ (1 << cell) ^ (1 << target)
+            # La sala no está en un estado del orden de llenado: se empuja normalmente.
+        pushes = [(box, direction)]
+        while (not self.deadlocks.is_target[cell] and self.is_tunnel(cell, direction)
+               and self.is_tunnel(box, direction)):
+            # La caja y el jugador (en la celda anterior de la caja) están dentro del túnel.
+            following = moves[cell][direction]
+            if following < 0 or new_boxes >> following & 1 or following == self.entrance:
+                break
+                # El empuje hacia la entrada de la sala se genera aparte para que actúe su macro.
+            boxes = new_boxes ^ (1 << cell) ^ (1 << following)
+            if self.deadlocks.is_deadlock(following, boxes):
+                break
+            pushes.append((cell, direction))
+            box, cell, new_boxes = cell, following, boxes
+        return tuple(pushes), new_boxes
+
+    # --- Sala de objetivos ---
+
+    def find_goal_room(self, start_boxes, start_player):
+        # Busca la entrada cuya eliminación deja todos los objetivos en la zona más pequeña,
+        # sin cajas ni jugador dentro al empezar.
+        board = self.board
+        if not board.targets or len(board.targets) > MAX_ROOM_TARGETS:
+            return
+        best = None
+        for entrance in range(board.size):
+            if self.deadlocks.is_target[entrance]:
+                continue
+            room = self.flood(board.targets[0], entrance)
+            if not all(room[target] for target in board.targets) or room[start_player]:
+                continue
+            room_bits = board.pack(cell for cell in range(board.size) if room[cell])
+            if room_bits & start_boxes:
+                continue
+            outside = [cell for cell in board.moves[entrance] if cell >= 0 and not room[cell]]
+            if len(outside) != 1:
+                continue
+                # Se exige una sola celda exterior junto a la entrada, desde la que se empuja hacia dentro.
+            if best is None or bin(room_bits).count('1') < bin(best[0]).count('1'):
+                best = (room_bits, entrance, outside[0])
+        if best is None:
+            return
+        self.room_bits, self.entrance, self.outside = best
+        self.order = self.fill_order()
+        self.prefixes = [board.pack(self.order[:k]) for k in range(len(self.order))]
+
+    def flood(self, start, blocked):
+        # Celdas alcanzables desde `start` sin pasar por `blocked`.
+        seen = bytearray(self.board.size)
+        seen[start] = 1
+        stack = [start]
+        while stack:
+            cell = stack.pop()
+            for neighbor in self.board.moves[cell]:
+                if neighbor >= 0 and neighbor != blocked and not seen[neighbor]:
+                    seen[neighbor] = 1
+                    stack.append(neighbor)
+        return seen
+
+    def fill_order(self):
+        # Búsqueda en profundidad de un orden en que se pueden llenar todos los objetivos, metiendo
+        # las cajas de una en una por la entrada. Devuelve [] si no existe.
+        targets = self.board.targets
+        failed = set()
+        order = []
+        paths = {}
+
+        def search(filled):
+            if len(order) == len(targets):
+                return True
+            if filled in failed:
+                return False
+            candidates = []
+            for target in targets:
+                if not filled >> target & 1:
+                    path = self.room_path(filled, target)
+                    if path is not None:
+                        candidates.append((-len(path), target, path))
+            candidates.sort()
+            # Primero los objetivos más lejanos: dejarlos para el final suele bloquearlos.
+            for _, target, path in candidates:
+                paths[len(order)] = path
+                order.append(target)
+                if search(filled | 1 << target):
+                    return True
+                order.pop()
+            failed.add(filled)
+            return False
+
+        if not search(0):
+            return []
+        self.paths = paths
+        return order
+
+    def room_path(self, filled, target):
+        # Empujes más cortos para llevar una caja desde la entrada hasta `target` con los objetivos
+        # de `filled` ya ocupados. El jugador empieza en la celda exterior y no sale de la sala.
+        board = self.board
+        moves = board.moves
+        allowed = self.room_bits | 1 << self.entrance
+        start = (self.entrance, self.outside)
+        came_from = {(self.entrance, self.canonical(self.outside, self.entrance, filled)): None}
+        queue = deque([start])
+        while queue:
+            box, player = queue.popleft()
+            if box == target:
+                pushes = []
+                state = (box, self.canonical(player, box, filled))
+                while came_from[state] is not None:
+                    state, push = came_from[state]
+                    pushes.append(push)
+                pushes.reverse()
+                return tuple(pushes)
+            reach = self.player_area(player, box, filled)
+            for direction in range(4):
+                behind = moves[box][direction ^ 2]
+                following = moves[box][direction]
+                if behind < 0 or behind not in reach or following < 0:
+                    continue
+                if not allowed >> following & 1 or filled >> following & 1:
+                    continue
+                if self.deadlocks.dead[following]:
+                    continue
+                state = (following, self.canonical(box, following, filled))
+                if state in came_from:
+                    continue
+                came_from[state] = ((box, self.canonical(player, box, filled)), (box, direction))
+                queue.append((following, box))
+        return None
+
+    def player_area(self, player, box, filled):
+        # Zona del jugador dentro de la sala, la entrada y la celda exterior.
+        allowed = self.room_bits | 1 << self.entrance | 1 << self.outside
+        area = {player}
+        stack = [player]
+        while stack:
+            cell = stack.pop()
+            for neighbor in self.board.moves[cell]:
+                if (neighbor >= 0 and neighbor not in area and neighbor != box and allowed >> neighbor & 1
+                        and not filled >> neighbor & 1):
+                    area.add(neighbor)
+                    stack.append(neighbor)
+        return area
+
+    def canonical(self, player, box, filled):
+        return min(self.player_area(player, box, filled))
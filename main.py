@@ -1,11 +1,14 @@
+import multiprocessing
 import pygame
-from game import Game
+from game import Game, parse_args
 
 def main():
     pygame.init()
-    game = Game()
+    args = parse_args()
+    game = Game(profile_startup=args.profile_startup, event_driven=not args.continuous_redraw)
     game.run()
     pygame.quit()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+from array import array
+
+INITIAL_CAPACITY = 1 << 6
+# Huecos iniciales del índice hash (potencia de dos); se duplica al superar la mitad de ocupación.
+
+
+class NodePool:
+    def __init__(self, board):
+        # Almacén compacto de los nodos de un A*: cada estado se guarda una sola vez, como bytes de
+        # ancho fijo, y se identifica por su posición. Padres, costes y movimientos van en arrays
+        # tipados paralelos, y un índice hash de direccionamiento abierto traduce clave -> posición.
+        self.width = ((1 << board.size) * board.size).bit_length() // 8 + 1
+        # Bytes necesarios para cualquier clave `board.key(cajas, jugador)`.
+        self.keys = bytearray()
+        self.parents = array('i')
+        self.costs = array('I')
+        self.moves = array('i')
+        # Movimiento que llevó al nodo, una secuencia de (celda, dirección): si tiene un solo
+        # elemento se guarda como celda * 4 + dirección; si no, como -1 - i para `macros[i]`.
+        self.macros = []
+        self.index = array('i', [-1]) * INITIAL_CAPACITY
+        self.mask = INITIAL_CAPACITY - 1
+
+    def __len__(self):
+        return len(self.parents)
+
+    def find(self, key):
+        # Posición del nodo con esta clave, o -1 si no está.
+        data = key.to_bytes(self.width, 'little')
+        slot = hash(data) & self.mask
+        index = self.index
+        keys = self.keys
+        width = self.width
+        while True:
+            node = index[slot]
+            if node < 0:
+                return -1
+            if keys[node * width:(node + 1) * width] == data:
+                return node
+            slot = (slot + 1) & self.mask
+
+    def add(self, key, parent, cost, move):
+        # Añade un nodo nuevo (la clave no debe estar) y devuelve su posición.
+        node = len(self.parents)
+        data = key.to_bytes(self.width, 'little')
+        self.keys += data
+        self.parents.append(parent)
+        self.costs.append(cost)
+        self.moves.append(self.encode(move))
+        if 2 * (node + 1) > len(self.index):
+            self.grow()
+        else:
+            self.insert(data, node)
+        return node
+
+    def update(self, node, parent, cost, move):
+        # Se ha encontrado un camino más barato hasta un nodo ya guardado.
+        self.parents[node] = parent
+        self.costs[node] = cost
+        self.moves[node] = self.encode(move, self.moves[node])
+
+    def encode(self, move, previous=0):
+        if move is None:
+            return 0
+            # Solo la raíz no tiene movimiento; su padre es -1.
+        if len(move) == 1:
+            cell, direction = move[0]
+            return cell * 4 + direction
+        if previous < 0:
+            self.macros[-1 - previous] = move
+            return previous
+            # Al reabrir un nodo se reutiliza su entrada: `macros` no crece más que el número de nodos.
+        self.macros.append(move)
+        return -len(self.macros)
+
+    def move(self, node):
+        code = self.moves[node]
+        return ((code >> 2, code & 3),) if code >= 0 else self.macros[-1 - code]
+
+    def key(self, node):
+        return int.from_bytes(self.keys[node * self.width:(node + 1) * self.width], 'little')
+
+    def insert(self, data, node):
+        slot = hash(data) & self.mask
+        while self.index[slot] >= 0:
+            slot = (slot + 1) & self.mask
+        self.index[slot] = node
+
+    def grow(self):
+        # Duplica el índice y vuelve a colocar todos los nodos.
+        capacity = len(self.index) * 2
+        self.index = array('i', [-1]) * capacity
+        self.mask = capacity - 1
+        width = self.width
+        for node in range(len(self.parents)):
+            self.insert(bytes(self.keys[node * width:(node + 1) * width]), node)
+
+    def path(self, node):
+        # Movimientos (celda, dirección) desde la raíz hasta `node`, recorriendo los padres por
+        # posición y deshaciendo los macro-movimientos.
+        moves = []
+        while self.parents[node] >= 0:
+            moves.extend(reversed(self.move(node)))
+            node = self.parents[node]
+        moves.reverse()
+        return moves
+
+    def memory_bytes(self):
+        return (len(self.keys) + self.parents.itemsize * len(self.parents) + self.costs.itemsize * len(self.costs)
+                + self.moves.itemsize * len(self.moves) + self.index.itemsize * len(self.index))
@@ -0,0 +1,47 @@
+class BucketQueue:
+    def __init__(self):
+        # Lista abierta de A* con prioridades enteras pequeñas: un cubo por valor de f y, dentro
+        # de cada uno, un cubo por h. Se saca siempre la menor f y, a igual f, la menor h
+        # (el nodo más cercano al objetivo). Insertar y sacar cuestan O(1) amortizado.
+        self.buckets = []
+        # buckets[f][h] = lista de (clave, g) usada como pila.
+        self.low_h = []
+        # low_h[f] = cota inferior de las h con entradas en el cubo f; `pop` avanza desde ahí.
+        self.low_f = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, f, h, key, cost):
+        while len(self.buckets) <= f:
+            self.buckets.append([])
+            self.low_h.append(0)
+        by_h = self.buckets[f]
+        while len(by_h) <= h:
+            by_h.append([])
+        if h < self.low_h[f]:
+            self.low_h[f] = h
+        by_h[h].append((key, cost))
+        if f < self.low_f:
+            self.low_f = f
+            # Con una heurística inconsistente f puede bajar; se retrocede el puntero.
+        self.size += 1
+
+    def pop(self):
+        # Devuelve (clave, g) de la entrada con menor (f, h). La cola no debe estar vacía.
+        # Tras la llamada, `low_f` es la f de la entrada devuelta.
+        buckets = self.buckets
+        while True:
+            by_h = buckets[self.low_f]
+            h = self.low_h[self.low_f]
+            while h < len(by_h) and not by_h[h]:
+                h += 1
+            if h < len(by_h):
+                break
+            by_h.clear()
+            self.low_f += 1
+            # Cubo agotado: se libera su lista de cubos de h y se pasa a la siguiente f.
+        self.low_h[self.low_f] = h
+        self.size -= 1
+        return by_h[h].pop()
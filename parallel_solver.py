@@ -0,0 +1,290 @@
+import multiprocessing
+import os
+import queue
+import time
+# A* distribuido por hash (HDA*): cada estado pertenece a un solo proceso, elegido por su hash
+# Zobrist, que guarda su lista abierta y sus estados vistos sin compartir nada con los demás.
+
+from heuristic import INF
+from level_pack import HeadlessLevel
+from open_list import BucketQueue
+from solver import Solver
+
+BATCH_SIZE = 64
+# Expansiones seguidas de un proceso antes de enviar los estados ajenos y leer su buzón.
+IDLE_WAIT = 0.05
+# Segundos que un proceso sin trabajo espera mensajes antes de volver a comprobar.
+PROBE_INTERVAL = 0.01
+# Pausa entre dos rondas de sondeo del coordinador.
+STOP_TIMEOUT = 1.0
+
+
+class HDAWorker:
+    def __init__(self, worker_id, level, inboxes, results):
+        # Un proceso de la búsqueda. Recibe estados por su buzón, expande los suyos y reparte
+        # los hijos según el hash. `results` es la cola única hacia el coordinador.
+        self.worker_id = worker_id
+        self.inboxes = inboxes
+        self.inbox = inboxes[worker_id]
+        self.results = results
+        self.solver = Solver(mode='push')
+        self.solver.prepare(level)
+        # Cada proceso compila su propia copia del tablero, los bloqueos y la heurística.
+        self.frontier = BucketQueue()
+        self.cost_so_far = {}
+        self.came_from = {}
+        self.matchings = {}
+        self.outboxes = [[] for _ in inboxes]
+        self.bound = INF
+        # Coste de la mejor solución conocida: no se expande nada con f igual o mayor.
+        self.sent = 0
+        self.received = 0
+        # Mensajes de estados enviados y recibidos, para la detección de terminación.
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.stopped = False
+
+    def run(self):
+        while not self.stopped:
+            self.read_inbox(block=not self.frontier)
+            for _ in range(BATCH_SIZE):
+                if self.stopped or not self.frontier:
+                    break
+                self.expand_next()
+            self.flush()
+
+    def read_inbox(self, block):
+        # Atiende todos los mensajes pendientes; si no hay trabajo, espera al primero.
+        try:
+            message = self.inbox.get(timeout=IDLE_WAIT) if block else self.inbox.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            self.handle(message)
+            try:
+                message = self.inbox.get_nowait()
+            except queue.Empty:
+                return
+
+    def handle(self, message):
+        kind = message[0]
+        if kind == 'states':
+            self.received += 1
+            for key, cost, estimate, parent in message[1]:
+                self.insert(key, cost, estimate, parent)
+        elif kind == 'bound':
+            self.bound = min(self.bound, message[1])
+        elif kind == 'probe':
+            self.results.put(('probe', message[1], self.worker_id, self.sent, self.received, not self.frontier,
+                              self.expanded, self.generated, self.duplicates, len(self.frontier),
+                              len(self.cost_so_far)))
+        elif kind == 'parent':
+            self.results.put(('parent', message[1], self.came_from.get(message[1])))
+        else:
+            self.stopped = True
+
+    def insert(self, key, cost, estimate, parent):
+        # Abre un estado propio si es nuevo o si llega con menos empujes; devuelve si se abrió.
+        if cost + estimate >= self.bound:
+            return False
+        if key in self.cost_so_far and cost >= self.cost_so_far[key]:
+            self.duplicates += 1
+            return False
+        self.cost_so_far[key] = cost
+        self.came_from[key] = parent
+        self.frontier.push(cost + estimate, estimate, key, cost)
+        return True
+
+    def expand_next(self):
+        solver = self.solver
+        board = solver.board
+        key, cost = self.frontier.pop()
+        if cost != self.cost_so_far[key] or self.frontier.low_f >= self.bound:
+            self.matchings.pop(key, None)
+            return
+            # Entrada obsoleta o que ya no puede mejorar la mejor solución conocida.
+        if solver.is_goal(key):
+            self.bound = cost
+            self.results.put(('goal', key, cost))
+            return
+        self.expanded += 1
+        matching = self.matchings.pop(key, None)
+        if matching is None:
+            _, matching = solver.assignment.evaluate(board.unpack(key // board.size))
+            # Los estados recibidos de otro proceso llegan sin emparejamiento.
+        for macro, new_boxes in solver.get_pushes(key):
+            self.generated += 1
+            box, player, target = solver.moved_box(macro)
+            estimate, new_matching = solver.assignment.update(matching, box, target)
+            if estimate >= INF:
+                continue
+            _, canonical = board.reachable(player, new_boxes)
+            new_key = board.key(new_boxes, canonical)
+            owner = board.zobrist(new_boxes, canonical) % len(self.inboxes)
+            parent = (key, macro)
+            new_cost = cost + len(macro)
+            if owner != self.worker_id:
+                self.outboxes[owner].append((new_key, new_cost, estimate, parent))
+            elif self.insert(new_key, new_cost, estimate, parent):
+                self.matchings[new_key] = new_matching
+
+    def flush(self):
+        # Envía a cada proceso, en un solo mensaje, los estados suyos generados en esta tanda.
+        for owner, batch in enumerate(self.outboxes):
+            if batch:
+                self.inboxes[owner].put(('states', batch))
+                self.sent += 1
+                self.outboxes[owner] = []
+
+
+def run_worker(worker_id, level, inboxes, results):
+    # Punto de entrada de cada proceso de la búsqueda paralela.
+    HDAWorker(worker_id, level, inboxes, results).run()
+
+
+class ParallelSolver(Solver):
+    def __init__(self, workers=None, **options):
+        # Igual que `Solver` en modo 'push', pero reparte un solo nivel entre `workers` procesos.
+        # Devuelve el mismo camino de pasos, con el número mínimo de empujes.
+        super().__init__(**options)
+        if self.mode != 'push' or self.engine != 'astar':
+            raise ValueError("La búsqueda paralela solo funciona con el motor 'astar' en modo 'push'")
+        self.workers = workers or os.cpu_count()
+        self.level = None
+
+    def compile_board(self, level):
+        self.level = HeadlessLevel.snapshot(level)
+        # Copia sin pygame que se envía a los procesos.
+        return super().compile_board(level)
+
+    def run_engine(self, start_boxes, start_player):
+        board = self.board
+        _, canonical = board.reachable(start_player, start_boxes)
+        start_key = board.key(start_boxes, canonical)
+        estimate, _ = self.assignment.evaluate(board.unpack(start_boxes))
+        if estimate >= INF:
+            return None
+        inboxes = [multiprocessing.Queue() for _ in range(self.workers)]
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=run_worker, args=(i, self.level, inboxes, results), daemon=True)
+                     for i in range(self.workers)]
+        for process in processes:
+            process.start()
+        try:
+            owner = board.zobrist(start_boxes, canonical) % self.workers
+            inboxes[owner].put(('states', [(start_key, 0, estimate, None)]))
+            goal = self.coordinate(inboxes, results, processes)
+            if goal is None:
+                return None
+            pushes = self.collect_pushes(goal, inboxes, results, processes)
+            if pushes is None:
+                return None
+            return self.pushes_to_steps(pushes, start_player, start_boxes)
+        finally:
+            for inbox in inboxes:
+                inbox.put(('stop',))
+            for process in processes:
+                process.join(STOP_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+    def broadcast(self, inboxes, message):
+        for inbox in inboxes:
+            inbox.put(message)
+
+    def coordinate(self, inboxes, results, processes):
+        # Recoge soluciones y sondea a los procesos hasta detectar la terminación: todos sin
+        # trabajo, tantos mensajes recibidos como enviados y los mismos contadores en dos rondas
+        # seguidas (método de los cuatro contadores). Devuelve la clave objetivo o None.
+        stats = self.stats
+        best_key, best_cost = None, INF
+        wave = 1
+        replies = {}
+        previous = None
+        next_probe = 0
+        reported = 0
+        while True:
+            if not replies and next_probe is not None and time.perf_counter() >= next_probe:
+                self.broadcast(inboxes, ('probe', wave))
+                next_probe = None
+            try:
+                message = results.get(timeout=PROBE_INTERVAL)
+            except queue.Empty:
+                if not all(process.is_alive() for process in processes):
+                    stats.status = 'error'
+                    return None
+                    # Un proceso ha muerto: sus estados se han perdido y la búsqueda no terminaría.
+                continue
+            if message[0] == 'goal':
+                _, key, cost = message
+                if cost < best_cost:
+                    best_key, best_cost = key, cost
+                    self.broadcast(inboxes, ('bound', cost))
+                continue
+            if message[0] != 'probe' or message[1] != wave:
+                continue
+            replies[message[2]] = message[3:]
+            if len(replies) < self.workers:
+                continue
+
+            counters = [replies[worker] for worker in range(self.workers)]
+            stats.nodes_expanded = sum(counter[3] for counter in counters)
+            stats.nodes_generated = sum(counter[4] for counter in counters)
+            stats.duplicate_hits = sum(counter[5] for counter in counters)
+            stats.update_peaks(sum(counter[6] for counter in counters), sum(counter[7] for counter in counters))
+            if self.node_limit is not None and stats.nodes_expanded > self.node_limit:
+                stats.status = 'node_limit'
+                return None
+            if self.time_limit is not None and time.perf_counter() - stats.started > self.time_limit:
+                stats.status = 'time_limit'
+                return None
+            if self.on_progress is not None and stats.nodes_expanded // self.progress_interval > reported:
+                reported = stats.nodes_expanded // self.progress_interval
+                stats.elapsed = time.perf_counter() - stats.started
+                if self.on_progress(stats) is False:
+                    stats.status = 'cancelled'
+                    return None
+
+            balance = tuple(counter[:3] for counter in counters)
+            sent = 1 + sum(counter[0] for counter in counters)
+            # El estado inicial lo envía el coordinador.
+            received = sum(counter[1] for counter in counters)
+            if all(counter[2] for counter in counters) and sent == received and balance == previous:
+                return best_key
+            previous = balance
+            wave += 1
+            replies = {}
+            next_probe = time.perf_counter() + PROBE_INTERVAL
+
+    def collect_pushes(self, key, inboxes, results, processes):
+        # Reconstruye la secuencia de empujes pidiendo el padre de cada estado a su dueño.
+        # Devuelve None (con `stats.status = 'error'`) si algún proceso ha muerto o no responde.
+        board = self.board
+        pushes = []
+        while True:
+            box_bits, player = board.split_key(key)
+            inboxes[board.zobrist(box_bits, player) % self.workers].put(('parent', key))
+            message = self.wait_parent(key, results, processes)
+            if message is None:
+                self.stats.status = 'error'
+                return None
+            if message[2] is None:
+                break
+            key, macro = message[2]
+            pushes.extend(reversed(macro))
+        pushes.reverse()
+        return pushes
+
+    def wait_parent(self, key, results, processes):
+        # Respuesta a la petición del padre de `key`; None si un proceso ha muerto o la respuesta
+        # no llega en `STOP_TIMEOUT` segundos. Los mensajes atrasados de la búsqueda se descartan.
+        while all(process.is_alive() for process in processes):
+            try:
+                message = results.get(timeout=STOP_TIMEOUT)
+            except queue.Empty:
+                return None
+            if message[0] == 'parent' and message[1] == key:
+                return message
+        return None
@@ -0,0 +1,184 @@
+import hashlib
+import mmap
+import os
+from collections import deque
+from itertools import combinations
+from math import comb
+
+from heuristic import INF
+
+DEFAULT_PATTERN_DIR = os.path.join(os.path.expanduser('~'), '.sokoban_uvp', 'patterns')
+UNREACHABLE = 255
+# Valor guardado para las colocaciones desde las que el patrón no tiene solución.
+MAX_PATTERN_BYTES = 64 * 1024 * 1024
+# Por encima de este tamaño no se construye la base de datos de un grupo.
+
+
+class PatternDatabase:
+    def __init__(self, board, targets, directory=DEFAULT_PATTERN_DIR):
+        # Empujes mínimos para llevar k cajas a los k objetivos `targets` cuando no hay más cajas
+        # en el tablero, para cada colocación de esas cajas y cada celda del jugador. Como el resto
+        # de cajas solo estorba, el valor nunca sobreestima el coste real de esas k cajas.
+        self.board = board
+        self.targets = sorted(targets)
+        self.count = len(self.targets)
+        self.live = self.find_live_cells()
+        self.rank = [-1] * board.size
+        for rank, cell in enumerate(self.live):
+            self.rank[cell] = rank
+        # Índice compacto de las celdas desde las que una caja puede llegar a algún objetivo del grupo.
+        self.binomial = [[comb(rank, k) for rank in range(len(self.live))] for k in range(self.count + 1)]
+        self.length = comb(len(self.live), self.count) * board.size
+        self.directory = directory
+        self.data = None
+
+    def find_live_cells(self):
+        # Igual que `DeadlockDetector.find_dead_squares`, pero solo hacia los objetivos del grupo.
+        moves = self.board.moves
+        live = bytearray(self.board.size)
+        queue = deque(self.targets)
+        for cell in self.targets:
+            live[cell] = 1
+        while queue:
+            cell = queue.popleft()
+            for direction in range(4):
+                box_cell = moves[cell][direction]
+                if box_cell < 0 or live[box_cell] or moves[box_cell][direction] < 0:
+                    continue
+                live[box_cell] = 1
+                queue.append(box_cell)
+        return [cell for cell in range(self.board.size) if live[cell]]
+
+    def index(self, cells):
+        # Índice combinatorio de una colocación (celdas vivas, en orden creciente).
+        value = 0
+        for k, cell in enumerate(cells, 1):
+            value += self.binomial[k][self.rank[cell]]
+        return value
+
+    def path(self):
+        # Archivo de la base de datos: hash del suelo y de los objetivos del grupo, trasladados al origen.
+        board = self.board
+        min_x = min(x for x, _ in board.cells)
+        min_y = min(y for _, y in board.cells)
+        description = repr((
+            [(x - min_x, y - min_y) for x, y in board.cells],
+            [(board.cells[cell][0] - min_x, board.cells[cell][1] - min_y) for cell in self.targets],
+        ))
+        return os.path.join(self.directory, hashlib.sha1(description.encode('utf-8')).hexdigest() + '.pdb')
+
+    def load(self):
+        # Proyecta en memoria la base de datos guardada o, si no existe, la construye y la guarda.
+        # Devuelve False si el grupo es demasiado grande.
+        if self.data is not None:
+            return True
+        if self.length > MAX_PATTERN_BYTES:
+            return False
+        path = self.path() if self.directory else None
+        if path is not None:
+            try:
+                with open(path, 'rb') as pattern_file:
+                    if os.fstat(pattern_file.fileno()).st_size == self.length:
+                        self.data = mmap.mmap(pattern_file.fileno(), 0, access=mmap.ACCESS_READ)
+                        return True
+                        # El mapa sigue siendo válido después de cerrar el archivo.
+            except (OSError, ValueError):
+                pass
+        self.data = self.build()
+        if path is not None:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                temporary = path + '.tmp'
+                with open(temporary, 'wb') as pattern_file:
+                    pattern_file.write(self.data)
+                os.replace(temporary, path)
+            except OSError:
+                pass
+                # Sin disco la base de datos sigue valiendo para esta búsqueda.
+        return True
+
+    def build(self):
+        # Búsqueda retrógrada en anchura: se tira de las cajas desde el objetivo del grupo.
+        board = self.board
+        size = board.size
+        data = bytearray([UNREACHABLE]) * self.length
+        goal = board.pack(self.targets)
+        seen = set()
+        queue = deque()
+        covered = bytearray(size)
+        for cell in range(size):
+            if goal >> cell & 1 or covered[cell]:
+                continue
+            reach, canonical = board.reachable(cell, goal)
+            for region_cell in range(size):
+                covered[region_cell] |= reach[region_cell]
+            seen.add(board.key(goal, canonical))
+            self.fill(data, goal, reach, 0)
+            queue.append((goal, reach, 0))
+            # Una semilla por cada zona en la que puede acabar el jugador.
+        while queue:
+            box_bits, reach, distance = queue.popleft()
+            for new_boxes, back, _, _ in board.pulls(box_bits, reach):
+                new_reach, canonical = board.reachable(back, new_boxes)
+                key = board.key(new_boxes, canonical)
+                if key in seen:
+                    continue
+                seen.add(key)
+                self.fill(data, new_boxes, new_reach, min(distance + 1, UNREACHABLE - 1))
+                queue.append((new_boxes, new_reach, distance + 1))
+        return data
+
+    def fill(self, data, box_bits, reach, distance):
+        # La distancia vale para cualquier celda de la zona del jugador.
+        size = self.board.size
+        base = self.index(self.board.unpack(box_bits)) * size
+        for cell in range(size):
+            if reach[cell]:
+                data[base + cell] = distance
+
+    def evaluate(self, boxes, player):
+        # Cota inferior de los empujes para llenar los objetivos del grupo con alguna de las cajas:
+        # el mínimo sobre todas las elecciones de k cajas. INF si ninguna elección puede hacerlo.
+        rank = self.rank
+        candidates = [cell for cell in boxes if rank[cell] >= 0]
+        best = UNREACHABLE
+        size = self.board.size
+        for cells in combinations(candidates, self.count):
+            value = self.data[self.index(cells) * size + player]
+            if value < best:
+                best = value
+                if best == 0:
+                    break
+        return INF if best == UNREACHABLE else best
+
+
+class PatternHeuristic:
+    def __init__(self, board, pattern_size=2, combine='add', directory=DEFAULT_PATTERN_DIR):
+        # Combina varias bases de datos de patrones. Con 'add' los objetivos se reparten en grupos
+        # disjuntos de `pattern_size` y se suman sus valores: cada caja cuenta en un solo grupo en
+        # la solución real. Con 'max' se usan todos los grupos posibles y se toma el mayor.
+        if combine not in ('add', 'max'):
+            raise ValueError(f"Combinación de patrones desconocida: {combine}")
+        self.combine = combine
+        targets = list(board.targets)
+        if combine == 'add':
+            groups = [targets[i:i + pattern_size] for i in range(0, len(targets), pattern_size)]
+            # Los objetivos van en orden de fila, así que cada grupo reúne objetivos cercanos.
+        else:
+            groups = list(combinations(targets, min(pattern_size, len(targets))))
+        self.databases = []
+        for group in groups:
+            if len(group) < 2:
+                continue
+                # Un grupo de un solo objetivo no aporta nada sobre la distancia de empuje.
+            database = PatternDatabase(board, group, directory)
+            if database.load():
+                self.databases.append(database)
+
+    def evaluate(self, boxes, player):
+        values = [database.evaluate(boxes, player) for database in self.databases]
+        if not values:
+            return 0
+        if self.combine == 'add':
+            return min(sum(values), INF)
+        return max(values)
@@ -1,6 +1,7 @@
 import sys
 import os
 from cx_Freeze import setup, Executable
+from asset_pack import ASSET_PACK, build_pack
 
 # Check if minecraft.ttf exists
 if os.path.exists("minecraft.ttf"):
@@ -8,6 +9,9 @@ if os.path.exists("minecraft.ttf"):
 else:
     font_file = None
 
+# Empaqueta las imágenes y los sonidos en un único archivo proyectado en memoria al arrancar
+build_pack(ASSET_PACK)
+
 # Dependencias
 build_exe_options = {
     "packages": ["pygame", "cv2", "numpy"],
@@ -16,13 +20,7 @@ build_exe_options = {
         "level.py",
         "player.py",
         "solver.py",
-        "img_buttons/",
-        "img_box/",
-        "img_celebration/",
-        "img_inicio/",
-        "img_levels/",
-        "img_player/",
-        "sounds/",
+        ASSET_PACK,
         "playita.mp4"
     ]
 }
@@ -43,16 +41,3 @@ setup(
     options={"build_exe": build_exe_options},
     executables=[Executable("game.py", base=base)]
 )
-
-# Ejecutable
-base = None
-if sys.platform == "win32":
-    base = "Win32GUI"
-
-setup(
-    name="Sokoban",
-    version="1.0",
-    description="Juego Sokoban",
-    options={"build_exe": build_exe_options},
-    executables=[Executable("game.py", base=base)]
-)
\ No newline at end of file
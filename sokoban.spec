@@ -1,17 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+from asset_pack import ASSET_PACK, build_pack
+
 block_cipher = None
 
+build_pack(ASSET_PACK)
+# Imágenes y sonidos van en un único paquete en lugar de sueltos.
+
 a = Analysis(['game.py'],
              pathex=['.'],
              binaries=[],
-             datas=[('img_buttons', 'img_buttons'),
-                    ('img_box', 'img_box'),
-                    ('img_celebration', 'img_celebration'),
-                    ('img_inicio', 'img_inicio'),
-                    ('img_levels', 'img_levels'),
-                    ('img_player', 'img_player'),
-                    ('sounds', 'sounds'),
+             datas=[(ASSET_PACK, '.'),
                     ('minecraft.ttf', '.')],
              hiddenimports=[],
              hookspath=[],
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import time
+import zlib
+
+from board import Board, DIRECTIONS
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.sokoban_uvp', 'solutions.cache')
+DEFAULT_MAX_BYTES = 1024 * 1024
+# Tamaño máximo (sin comprimir) de las entradas guardadas; al superarlo se expulsan las menos usadas.
+LETTERS = 'drul'
+# Una letra por dirección, en el mismo orden que `board.DIRECTIONS`.
+
+
+class SolutionCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, autosave=True):
+        # Almacén de soluciones en disco: un JSON comprimido con zlib de clave ->
+        # [movimientos desde el primer empuje, último uso, celda del jugador antes de ese empuje].
+        self.path = path
+        self.max_bytes = max_bytes
+        self.autosave = autosave
+        self.entries = None
+        self.hits = 0
+
+    def load(self):
+        # Lee el archivo la primera vez que se necesita; un archivo dañado se trata como vacío.
+        if self.entries is not None:
+            return
+        self.entries = {}
+        try:
+            with open(self.path, 'rb') as cache_file:
+                self.entries = json.loads(zlib.decompress(cache_file.read()).decode('utf-8'))
+        except (OSError, ValueError, zlib.error):
+            pass
+
+    def save(self):
+        # Escritura atómica: se escribe en un temporal y se reemplaza el archivo.
+        if self.entries is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = zlib.compress(json.dumps(self.entries, separators=(',', ':')).encode('utf-8'), 9)
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as cache_file:
+            cache_file.write(data)
+        os.replace(temporary, self.path)
+
+    def key(self, board, box_bits, player):
+        # Hash canónico del nivel: suelo interior, objetivos, cajas y zona del jugador (su celda
+        # canónica), con coordenadas trasladadas al origen. Devuelve (clave, celda canónica).
+        _, canonical = board.reachable(player, box_bits)
+        min_x = min(x for x, _ in board.cells)
+        min_y = min(y for _, y in board.cells)
+
+        def normalize(cells):
+            return [(board.cells[cell][0] - min_x, board.cells[cell][1] - min_y) for cell in cells]
+
+        description = repr((
+            normalize(range(board.size)),
+            sorted(normalize(board.targets)),
+            normalize(board.unpack(box_bits)),
+            normalize([canonical]),
+        ))
+        return hashlib.sha1(description.encode('utf-8')).hexdigest(), canonical
+
+    def lookup(self, board, box_bits, player):
+        # Devuelve la lista de pasos desde la posición real del jugador, o None si no está guardada.
+        self.load()
+        key, _ = self.key(board, box_bits, player)
+        entry = self.entries.get(key)
+        if entry is None or len(entry) < 3:
+            return None
+            # Las entradas antiguas (sin celda de inicio) se tratan como ausentes y se reescriben.
+        entry[1] = int(time.time())
+        self.hits += 1
+        steps = [DIRECTIONS[LETTERS.index(letter)] for letter in entry[0]]
+        return board.walk(player, entry[2], box_bits) + steps
+        # Las soluciones se guardan desde el primer empuje; se antepone el camino hasta la celda
+        # desde la que se hace.
+
+    def store(self, board, box_bits, player, steps):
+        # Guarda una solución a partir de su primer empuje, junto con la celda desde la que se hace.
+        # Así no depende de dónde estuviera el jugador dentro de su zona.
+        self.load()
+        key, _ = self.key(board, box_bits, player)
+        steps = [tuple(step) for step in steps]
+        start = 0
+        while start < len(steps):
+            cell = board.moves[player][DIRECTIONS.index(steps[start])]
+            if box_bits >> cell & 1:
+                break
+            player = cell
+            start += 1
+        self.entries[key] = [''.join(LETTERS[DIRECTIONS.index(step)] for step in steps[start:]), int(time.time()), player]
+        self.evict()
+        if self.autosave:
+            self.save()
+
+    def store_level(self, level, steps):
+        board = Board(level)
+        self.store(board, board.pack_boxes(level.boxes), board.index[tuple(level.player_pos)], steps)
+
+    def size_bytes(self):
+        return sum(len(key) + len(entry[0]) + 16 for key, entry in self.entries.items())
+
+    def evict(self):
+        # Expulsa las entradas usadas hace más tiempo hasta quedar por debajo del límite.
+        size = self.size_bytes()
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1][1]):
+            if size <= self.max_bytes:
+                break
+            size -= len(key) + len(entry[0]) + 16
+            del self.entries[key]
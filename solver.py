@@ -1,96 +1,540 @@
-import heapq
-# se usa para manejar la cola de prioridad del algoritmo A*.
+from time import perf_counter
+from board import Board, DIRECTIONS
+# tablero compilado: celdas indexadas, bitboards de cajas y claves Zobrist.
+from backward_table import BackwardTable, BACKWARD_STATES
+from deadlock import DeadlockDetector
+from heuristic import AssignmentHeuristic, INF
+from macros import MacroMoves
+from node_pool import NodePool
+from open_list import BucketQueue
+from pattern_database import DEFAULT_PATTERN_DIR, PatternHeuristic
+# cola de prioridad por cubos para la lista abierta del A* (prioridades enteras pequeñas).
+from solver_stats import SolverStats, TUPLE_BYTES
+from transposition import TranspositionTable
+
+MATCHING_CACHE_LIMIT = 200000
+# Máximo de emparejamientos guardados para nodos abiertos (y de heurísticas por configuración de
+# cajas en modo 'step'); por encima se recalculan completos.
+TIME_CHECK_INTERVAL = 256
+# Cada cuántas expansiones se consulta el reloj para el límite de tiempo.
+PROGRESS_INTERVAL = 1000
+# Cada cuántas expansiones se llama a `on_progress` por defecto, si se ha indicado.
+OPEN_ENTRY_BYTES = 8 + TUPLE_BYTES
+# Memoria aproximada de una entrada de la lista abierta: referencia y tupla (nodo, coste).
+
 
 class Solver:
+    def __init__(self, mode='push', engine='astar', memory_mb=64, time_limit=None, node_limit=None,
+                 on_progress=None, progress_interval=PROGRESS_INTERVAL, cache=None,
+                 backward_states=BACKWARD_STATES, patterns=None, pattern_combine='add',
+                 pattern_dir=DEFAULT_PATTERN_DIR, macros=True):
+        # 'push' ramifica solo sobre empujes de cajas; 'step' expande paso a paso como antes.
+        if mode not in ('push', 'step'):
+            raise ValueError(f"Modo de búsqueda desconocido: {mode}")
+        # 'astar' guarda todos los estados; 'ida' usa IDA* con una tabla de transposición
+        # de tamaño fijo, de modo que la memoria nunca pasa de `memory_mb`.
+        # 'bidirectional' recorre primero hacia atrás desde el objetivo (tirando de las cajas) y
+        # el A* hacia delante termina al encontrarse con esos estados.
+        if engine not in ('astar', 'ida', 'bidirectional'):
+            raise ValueError(f"Motor de búsqueda desconocido: {engine}")
+        if engine != 'astar' and mode != 'push':
+            raise ValueError(f"El motor '{engine}' solo funciona en modo 'push'")
+        self.mode = mode
+        self.engine = engine
+        self.memory_mb = memory_mb
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        # Límites opcionales (segundos y nodos expandidos); al alcanzarlos `solve` devuelve None.
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        # on_progress(stats) se llama cada `progress_interval` expansiones; si devuelve False se cancela.
+        self.cache = cache
+        # `SolutionCache` opcional: se consulta antes de buscar y se actualiza al resolver.
+        self.backward_states = backward_states
+        # Tamaño de la tabla hacia atrás del motor 'bidirectional'.
+        self.backward = None
+        self.pattern_size = patterns
+        self.pattern_combine = pattern_combine
+        self.pattern_dir = pattern_dir
+        # Si `patterns` vale 2 o 3, la heurística se refuerza con bases de datos de patrones sobre
+        # grupos de ese número de objetivos, guardadas en `pattern_dir` (None: solo en memoria).
+        self.patterns = None
+        self.use_macros = macros
+        # En modo 'push', agrupa los empujes por túneles y los de llenado de la sala de objetivos.
+        self.macros = None
+        self.stats = SolverStats()
+        # Estadísticas de la última búsqueda. `stats.status` vale 'solved', 'unsolvable',
+        # 'time_limit', 'node_limit', 'cancelled' o, en la búsqueda paralela, 'error'.
+
+    @property
+    def status(self):
+        return self.stats.status
+
+    @property
+    def nodes(self):
+        return self.stats.nodes_expanded
+
+    @property
+    def cache_hit(self):
+        return self.stats.cache_hit
+
     def solve(self, level):
-        start_state = self.get_state(level)
+        return self.solve_with_stats(level)[0]
+
+    def solve_with_stats(self, level):
+        # Igual que `solve`, pero devuelve también el `SolverStats` de la búsqueda.
+        self.stats = SolverStats()
+        path = self.search(level)
+        self.stats.elapsed = perf_counter() - self.stats.started
+        if self.stats.status is None:
+            self.stats.status = 'unsolvable' if path is None else 'solved'
+        return path, self.stats
+
+    def prepare(self, level):
+        # Compila el nivel y las tablas que usa la búsqueda. Devuelve (bitboard de cajas, celda del jugador),
+        # o None si el nivel no tiene solución porque alguna caja queda fuera del alcance del jugador.
+        start = self.compile_board(level)
+        if start is not None:
+            self.build_tables(*start)
+        return start
+
+    def compile_board(self, level):
+        # Solo el tablero: basta para consultar el almacén de soluciones.
+        self.board = Board(level)
+        # Compila el nivel una sola vez: a partir de aquí los estados son enteros empaquetados.
+        self.backward = None
+        start_boxes = self.board.pack_boxes(level.boxes)
+        if start_boxes is None:
+            self.stats.status = 'unsolvable'
+            return None
+        return start_boxes, self.board.index[tuple(level.player_pos)]
+
+    def build_tables(self, start_boxes, start_player):
+        # Bloqueos, heurísticas y macro-movimientos; lo caro de preparar un nivel.
+        self.deadlocks = DeadlockDetector(self.board)
+        # Precalcula las casillas muertas del nivel antes de buscar.
+        self.assignment = AssignmentHeuristic(self.board)
+        # Distancias de empuje objetivo-celda calculadas una vez por nivel.
+        self.heuristic_cache = {}
+        if self.pattern_size:
+            self.patterns = PatternHeuristic(self.board, self.pattern_size, self.pattern_combine, self.pattern_dir)
+            # Se construyen la primera vez que se ve el nivel; después se proyectan desde disco.
+        if self.use_macros and self.mode == 'push':
+            self.macros = MacroMoves(self.board, self.deadlocks, start_boxes, start_player)
+
+    def search(self, level):
+        start = self.compile_board(level)
+        if start is None:
+            return None
+        start_boxes, start_player = start
+        if self.cache is not None:
+            path = self.cache.lookup(self.board, start_boxes, start_player)
+            if path is not None:
+                self.stats.cache_hit = True
+                return path
+                # Nivel ya resuelto antes: no hace falta construir las tablas ni buscar.
+        self.build_tables(start_boxes, start_player)
+        if self.deadlocks.is_dead_state(start_boxes):
+            return None
+            # Si alguna caja ya está en una casilla muerta no hay solución.
+        path = self.run_engine(start_boxes, start_player)
+        if path is not None and self.cache is not None:
+            self.cache.store(self.board, start_boxes, start_player, path)
+        return path
+
+    def run_engine(self, start_boxes, start_player):
+        if self.engine == 'ida':
+            return self.solve_ida(start_boxes, start_player)
+            # IDA* con memoria acotada por la tabla de transposición.
+        if self.engine == 'bidirectional':
+            self.backward = BackwardTable(self.board, bin(start_boxes).count('1'), self.backward_states)
+            self.backward.start()
+            # La tabla crece durante el A* hacia delante, en `solve_pushes`.
+        if self.mode == 'push':
+            return self.solve_pushes(start_boxes, start_player)
+            # En modo 'push' el A* trabaja sobre empujes y después se expande a pasos.
+        return self.solve_steps(start_boxes, start_player)
+
+    def solve_steps(self, start_boxes, start_player):
+        start_state = self.get_state(start_boxes, start_player)
         # Obtiene el estado inicial del nivel, que incluye la posición del jugador y las cajas.
-        goal_state = frozenset(level.targets)
-        # Define el estado objetivo como las posiciones objetivo para las cajas.
 
-        frontier = [(0, start_state)]
-        # Inicializa la cola de prioridad con el estado inicial, con costo 0.
-        came_from = {}
-        # Almacena de dónde vino cada estado para reconstruir el camino.
-        cost_so_far = {start_state: 0}
-        # Almacena el costo acumulado para llegar a cada estado.
+        pool = NodePool(self.board)
+        # Cada estado se guarda una vez; padre y coste van en arrays indexados por nodo.
+        start = pool.add(start_state, -1, 0, None)
+        frontier = BucketQueue()
+        frontier.push(0, 0, start, 0)
+        # Inicializa la lista abierta con el nodo inicial, con costo 0.
 
+        stats = self.stats
         while frontier:
-            current_cost, current_state = heapq.heappop(frontier)
-            # Extrae el estado con la prioridad más baja de la cola.
+            clock = perf_counter()
+            node, current_cost = frontier.pop()
+            # Extrae el nodo con la menor f (y, a igual f, la menor h).
+            stats.time_heap += perf_counter() - clock
+            if current_cost != pool.costs[node]:
+                continue
+                # Entrada obsoleta: el estado se volvió a encolar con un coste menor.
+            current_state = pool.key(node)
 
-            if self.is_goal(current_state, goal_state):
-                return self.reconstruct_path(came_from, start_state, current_state)
+            if self.is_goal(current_state):
+                return self.reconstruct_path(pool, node)
                 # Si se alcanza el estado objetivo, reconstruye y devuelve el camino.
+            stats.update_peaks(len(frontier) + 1, len(pool), pool.memory_bytes() + len(frontier) * OPEN_ENTRY_BYTES)
+            if not self.count_expansion():
+                return None
+                # Se ha alcanzado el límite de tiempo o de nodos.
 
-            for next_state in self.get_neighbors(current_state, level):
+            clock = perf_counter()
+            neighbors = self.get_neighbors(current_state)
+            stats.time_neighbors += perf_counter() - clock
+            for move, next_state in neighbors:
                 # Itera sobre los estados vecinos posibles desde el estado actual.
-                new_cost = cost_so_far[current_state] + 1
+                new_cost = current_cost + 1
                 # Calcula el nuevo costo para llegar al vecino.
+                stats.nodes_generated += 1
 
-                if next_state not in cost_so_far or new_cost < cost_so_far[next_state]:
+                next_node = pool.find(next_state)
+                if next_node < 0 or new_cost < pool.costs[next_node]:
                     # Actualiza si el vecino no ha sido visitado o si se encuentra un costo menor.
-                    cost_so_far[next_state] = new_cost
-                    priority = new_cost + self.heuristic(next_state, goal_state)
-                    # Calcula la prioridad combinando el costo y la heurística.
-                    heapq.heappush(frontier, (priority, next_state))
-                    # Añade el vecino a la cola de prioridad.
-                    came_from[next_state] = current_state
-                    # Registra de dónde se llegó a este vecino.
+                    clock = perf_counter()
+                    estimate = self.heuristic(next_state)
+                    stats.time_heuristic += perf_counter() - clock
+                    if estimate >= INF:
+                        continue
+                        # Ninguna asignación de cajas a objetivos es posible: bloqueo.
+                    if next_node < 0:
+                        next_node = pool.add(next_state, node, new_cost, move)
+                    else:
+                        pool.update(next_node, node, new_cost, move)
+                    # Registra el coste y de qué nodo se llegó a este vecino.
+                    clock = perf_counter()
+                    frontier.push(new_cost + estimate, estimate, next_node, new_cost)
+                    # Añade el vecino a la lista abierta con prioridad costo + heurística.
+                    stats.time_heap += perf_counter() - clock
+                else:
+                    stats.duplicate_hits += 1
 
         return None
         # Devuelve `None` si no encuentra una solución.
 
-    def get_state(self, level):
-        # Representa el estado como la posición del jugador y las cajas.
-        return (level.player_pos[0], level.player_pos[1], frozenset(level.boxes))
+    def get_state(self, box_bits, player):
+        # Representa el estado como un único entero: bitboard de cajas y celda del jugador.
+        return self.board.key(box_bits, player)
 
-    def is_goal(self, state, goal_state):
+    def is_goal(self, state):
         # Comprueba si todas las cajas están en las posiciones objetivo.
-        return state[2] == goal_state
+        box_bits, _ = self.board.split_key(state)
+        return box_bits & ~self.board.target_bits == 0
 
-    def get_neighbors(self, state, level):
-        # Genera los estados vecinos válidos desde el estado actual.
-        x, y, boxes = state
+    def get_neighbors(self, state):
+        # Genera los estados vecinos válidos desde el estado actual, como pares (movimiento,
+        # estado) donde el movimiento es ((celda del jugador, dirección),).
+        box_bits, player = self.board.split_key(state)
         neighbors = []
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+        for direction, cell in enumerate(self.board.moves[player]):
             # Intenta mover al jugador en las cuatro direcciones posibles.
-            new_x, new_y = x + dx, y + dy
-            if (new_x, new_y) in level.walls:
+            if cell < 0:
                 continue
                 # Salta si el jugador se mueve hacia una pared.
 
-            if (new_x, new_y) in boxes:
+            if box_bits >> cell & 1:
                 # Si el jugador intenta empujar una caja:
-                push_x, push_y = new_x + dx, new_y + dy
+                push = self.board.moves[cell][direction]
                 # Calcula la nueva posición de la caja.
-                if (push_x, push_y) not in level.walls and (push_x, push_y) not in boxes:
+                if push >= 0 and not box_bits >> push & 1:
                     # Solo permite mover la caja si el espacio está libre.
-                    new_boxes = frozenset(b if b != (new_x, new_y) else (push_x, push_y) for b in boxes)
-                    neighbors.append((new_x, new_y, new_boxes))
+                    new_boxes = box_bits ^ (1 << cell) ^ (1 << push)
+                    if self.deadlocks.is_deadlock(push, new_boxes):
+                        continue
+                        # Descarta el empuje si deja la caja bloqueada sin objetivo.
+                    neighbors.append((((player, direction),), self.board.key(new_boxes, cell)))
                     # Añade el estado con la nueva posición de la caja.
             else:
-                neighbors.append((new_x, new_y, boxes))
+                neighbors.append((((player, direction),), self.board.key(box_bits, cell)))
                 # Si no hay caja, simplemente mueve al jugador.
 
         return neighbors
 
-    def heuristic(self, state, goal_state):
-        # Calcula la heurística basada en la distancia de Manhattan de cada caja al objetivo más cercano.
-        _, _, boxes = state
-        return sum(min(abs(bx - gx) + abs(by - gy) for gx, gy in goal_state) for bx, by in boxes)
+    def heuristic(self, state):
+        # Coste del emparejamiento mínimo cajas-objetivos con distancias de empuje reales.
+        # Admisible: cada caja necesita al menos esos empujes y cada objetivo admite una sola caja.
+        box_bits, _ = self.board.split_key(state)
+        estimate = self.heuristic_cache.get(box_bits)
+        if estimate is None:
+            estimate = self.assignment.evaluate(self.board.unpack(box_bits))[0]
+            if len(self.heuristic_cache) < MATCHING_CACHE_LIMIT:
+                self.heuristic_cache[box_bits] = estimate
+            # En modo 'step' muchos estados comparten cajas; se calcula una vez por configuración,
+            # con el mismo límite que los emparejamientos del modo 'push'.
+        return self.pattern_estimate(box_bits, self.board.split_key(state)[1], estimate)
+
+    def pattern_estimate(self, box_bits, player, estimate):
+        # Máximo entre la heurística de asignación y la de patrones: ambas son admisibles.
+        if self.patterns is None or estimate >= INF:
+            return estimate
+        return max(estimate, self.patterns.evaluate(self.board.unpack(box_bits), player))
+
+    def reconstruct_path(self, pool, node):
+        # Reconstruye el camino de pasos recorriendo los padres del nodo objetivo hasta la raíz.
+        return [DIRECTIONS[direction] for _, direction in pool.path(node)]
+
+    def count_expansion(self):
+        # Cuenta una expansión y comprueba los límites; devuelve False si hay que parar.
+        stats = self.stats
+        stats.nodes_expanded += 1
+        nodes = stats.nodes_expanded
+        if self.node_limit is not None and nodes > self.node_limit:
+            stats.status = 'node_limit'
+            return False
+        if self.time_limit is not None and nodes % TIME_CHECK_INTERVAL == 0:
+            if perf_counter() - stats.started > self.time_limit:
+                stats.status = 'time_limit'
+                return False
+        if self.on_progress is not None and nodes % self.progress_interval == 0:
+            stats.elapsed = perf_counter() - stats.started
+            if self.on_progress(stats) is False:
+                stats.status = 'cancelled'
+                return False
+        return True
 
-    def reconstruct_path(self, came_from, start, goal):
-        # Reconstruye el camino desde el estado inicial al estado objetivo.
-        current = goal
+    # --- Búsqueda a nivel de empujes ---
+
+    def solve_pushes(self, start_boxes, start_player):
+        _, start_canonical = self.board.reachable(start_player, start_boxes)
+        start_key = self.board.key(start_boxes, start_canonical)
+        # La clave de un estado es el bitboard de cajas y la celda canónica (la menor) de la zona del jugador.
+
+        start_estimate, start_matching = self.assignment.evaluate(self.board.unpack(start_boxes))
+        start_estimate = self.pattern_estimate(start_boxes, start_canonical, start_estimate)
+        if start_estimate >= INF:
+            return None
+        pool = NodePool(self.board)
+        start = pool.add(start_key, -1, 0, None)
+        frontier = BucketQueue()
+        frontier.push(start_estimate, start_estimate, start, 0)
+        # La lista abierta guarda posiciones del almacén de nodos, no claves.
+        matchings = {start: start_matching}
+        # Emparejamiento de cada nodo abierto, para actualizar el de sus hijos de forma incremental.
+
+        stats = self.stats
+        backward = self.backward
+        expanded = 0
+        # Expansiones hacia delante, para equilibrarlas con las de la búsqueda hacia atrás.
+        while frontier:
+            clock = perf_counter()
+            node, cost = frontier.pop()
+            stats.time_heap += perf_counter() - clock
+            if cost != pool.costs[node]:
+                continue
+                # Copia obsoleta de un estado que ya se reabrió con menos empujes: no se reexpande.
+            key = pool.key(node)
+            if backward is not None:
+                while backward.growing and backward.expanded < expanded:
+                    if not self.count_expansion():
+                        return None
+                    backward.expand()
+                    # Se alternan ambas direcciones: tantas expansiones hacia atrás como hacia delante.
+                estimate = backward.estimate(key, frontier.low_f - cost)
+                if cost + estimate > frontier.low_f:
+                    if estimate < INF:
+                        frontier.push(cost + estimate, estimate, node, cost)
+                    continue
+                    # La tabla ha crecido desde que se encoló: se reencola con la cota mejorada.
+                if key in backward.distance:
+                    pushes = pool.path(node) + backward.pushes_from(key)
+                    return self.pushes_to_steps(pushes, start_player, start_boxes)
+                    # Encuentro con la búsqueda hacia atrás con f mínima: el camino es óptimo.
+            if self.is_goal(key):
+                pushes = pool.path(node)
+                return self.pushes_to_steps(pushes, start_player, start_boxes)
+                # Convierte la lista de empujes en la lista de pasos que reproduce `Game.update`.
+            stats.update_peaks(len(frontier) + 1, len(pool), pool.memory_bytes() + len(frontier) * OPEN_ENTRY_BYTES)
+            if not self.count_expansion():
+                return None
+            expanded += 1
+
+            clock = perf_counter()
+            matching = matchings.pop(node, None)
+            if matching is None:
+                _, matching = self.assignment.evaluate(self.board.unpack(key // self.board.size))
+            stats.time_heuristic += perf_counter() - clock
+            clock = perf_counter()
+            pushes = self.get_pushes(key)
+            stats.time_neighbors += perf_counter() - clock
+            for macro, new_boxes in pushes:
+                box, player, target = self.moved_box(macro)
+                clock = perf_counter()
+                _, canonical = self.board.reachable(player, new_boxes)
+                # Tras empujar, el jugador queda en la posición anterior de la caja.
+                stats.time_neighbors += perf_counter() - clock
+                new_key = self.board.key(new_boxes, canonical)
+                new_cost = cost + len(macro)
+                stats.nodes_generated += 1
+                child = pool.find(new_key)
+                if child < 0 or new_cost < pool.costs[child]:
+                    clock = perf_counter()
+                    estimate, new_matching = self.assignment.update(matching, box, target)
+                    # Solo se ha movido una caja: basta un camino aumentante sobre el emparejamiento del padre.
+                    estimate = self.pattern_estimate(new_boxes, canonical, estimate)
+                    if backward is not None and estimate < INF:
+                        estimate = backward.estimate(new_key, estimate)
+                    stats.time_heuristic += perf_counter() - clock
+                    if estimate >= INF:
+                        continue
+                    if child < 0:
+                        child = pool.add(new_key, node, new_cost, macro)
+                    else:
+                        pool.update(child, node, new_cost, macro)
+                    if len(matchings) < MATCHING_CACHE_LIMIT:
+                        matchings[child] = new_matching
+                    clock = perf_counter()
+                    frontier.push(new_cost + estimate, estimate, child, new_cost)
+                    stats.time_heap += perf_counter() - clock
+                else:
+                    stats.duplicate_hits += 1
+
+        return None
+
+    # --- IDA* con tabla de transposición ---
+
+    def solve_ida(self, start_boxes, start_player):
+        board = self.board
+        table = TranspositionTable(self.memory_mb)
+        _, canonical = board.reachable(start_player, start_boxes)
+        start_key = board.key(start_boxes, canonical)
+        start_hash = board.zobrist(start_boxes, canonical)
+        estimate, matching = self.assignment.evaluate(board.unpack(start_boxes))
+        estimate = self.pattern_estimate(start_boxes, canonical, estimate)
+        bound = estimate
+        iteration = 0
+        while bound < INF:
+            iteration += 1
+            pushes, bound = self.ida_iteration(start_key, start_hash, estimate, matching, bound, iteration, table)
+            # Cada iteración devuelve la solución o la menor f que superó la cota.
+            if pushes is not None:
+                return self.pushes_to_steps([push for macro in pushes for push in macro], start_player, start_boxes)
+        return None
+
+    def ida_iteration(self, start_key, start_hash, estimate, matching, bound, iteration, table):
+        # Búsqueda en profundidad acotada por `bound`, con una pila explícita en lugar de recursión.
+        # Cada marco: [clave, hash, g, h, emparejamiento, hijos, índice, menor f excedida, exacto].
+        board = self.board
+        stats = self.stats
+        table.store(start_hash, 0, estimate, iteration)
+        stack = [[start_key, start_hash, 0, estimate, matching, None, 0, INF, True]]
         path = []
-        while current != start:
-            prev = came_from[current]
-            # Retrocede al estado anterior.
-            dx, dy = current[0] - prev[0], current[1] - prev[1]
-            # Calcula el movimiento realizado.
-            path.append((dx, dy))
-            current = prev
-        path.reverse()
-        # Invierte el camino para que esté en el orden correcto.
-        return path
+        while stack:
+            frame = stack[-1]
+            key, zobrist, cost, estimate, matching, children, index, _, _ = frame
+            if children is None:
+                if self.is_goal(key):
+                    return path, bound
+                stats.update_peaks(len(stack), table.stored, table.memory_bytes() + len(stack) * 256)
+                # La memoria de IDA* es la tabla fija más la pila de la rama actual.
+                if not self.count_expansion():
+                    return None, INF
+                children = []
+                clock = perf_counter()
+                pushes = self.get_pushes(key)
+                stats.time_neighbors += perf_counter() - clock
+                for macro, new_boxes in pushes:
+                    box, player, target = self.moved_box(macro)
+                    clock = perf_counter()
+                    child_estimate, child_matching = self.assignment.update(matching, box, target)
+                    stats.time_heuristic += perf_counter() - clock
+                    if child_estimate >= INF:
+                        continue
+                    clock = perf_counter()
+                    _, canonical = board.reachable(player, new_boxes)
+                    stats.time_neighbors += perf_counter() - clock
+                    clock = perf_counter()
+                    child_estimate = self.pattern_estimate(new_boxes, canonical, child_estimate)
+                    stats.time_heuristic += perf_counter() - clock
+                    if child_estimate >= INF:
+                        continue
+                    stats.nodes_generated += 1
+                    old_player = key % board.size
+                    child_hash = (zobrist ^ board.box_keys[box] ^ board.box_keys[target]
+                                  ^ board.player_keys[old_player] ^ board.player_keys[canonical])
+                    # Hash Zobrist incremental: se sacan la caja y el jugador antiguos y se meten los nuevos.
+                    children.append((child_estimate, board.key(new_boxes, canonical), child_hash,
+                                     child_matching, macro))
+                children.sort(key=lambda child: child[0])
+                # Orden de movimientos: primero los hijos que la heurística considera más cercanos.
+                frame[5] = children
+            if index == len(children):
+                if frame[8] and frame[7] < INF:
+                    table.raise_bound(zobrist, frame[7] - cost)
+                    # Subárbol agotado sin podas por la tabla: su cota inferior real es al menos esta.
+                stack.pop()
+                if path:
+                    path.pop()
+                if stack:
+                    parent = stack[-1]
+                    parent[7] = min(parent[7], frame[7])
+                    parent[8] = parent[8] and frame[8]
+                continue
+            frame[6] = index + 1
+            child_estimate, child_key, child_hash, child_matching, macro = children[index]
+            child_cost = cost + len(macro)
+            entry = table.probe(child_hash)
+            if entry is not None:
+                stored_cost, stored_bound, stored_iteration = entry
+                if stored_cost < child_cost or (stored_cost == child_cost and stored_iteration == iteration):
+                    stats.duplicate_hits += 1
+                    frame[8] = False
+                    continue
+                    # Ya se llegó a este estado por un camino más barato, o se exploró con esta cota.
+                child_estimate = max(child_estimate, stored_bound)
+            f = child_cost + child_estimate
+            if f > bound:
+                frame[7] = min(frame[7], f)
+                continue
+            table.store(child_hash, child_cost, child_estimate, iteration)
+            path.append(macro)
+            stack.append([child_key, child_hash, child_cost, child_estimate, child_matching, None, 0, INF, True])
+        return None, frame[7]
+
+    def get_pushes(self, key):
+        # Genera los empujes posibles: (secuencia de empujes (caja, dirección), nuevo bitboard de
+        # cajas). La secuencia tiene un solo empuje salvo en los macro-movimientos.
+        box_bits, player = self.board.split_key(key)
+        reach, _ = self.board.reachable(player, box_bits)
+        moves = self.board.moves
+        pushes = []
+        for box in self.board.unpack(box_bits):
+            for direction, target in enumerate(moves[box]):
+                behind = moves[box][direction ^ 2]
+                # Las direcciones opuestas difieren en el bit 1 (0<->2, 1<->3).
+                if behind < 0 or not reach[behind]:
+                    continue
+                    # El jugador debe poder colocarse detrás de la caja.
+                if target < 0 or box_bits >> target & 1:
+                    continue
+                new_boxes = box_bits ^ (1 << box) ^ (1 << target)
+                if self.deadlocks.is_deadlock(target, new_boxes):
+                    continue
+                    # Poda los empujes que llevan a un bloqueo antes de registrarlos.
+                if self.macros is not None:
+                    pushes.append(self.macros.extend(box, direction, new_boxes))
+                else:
+                    pushes.append((((box, direction),), new_boxes))
+        return pushes
+
+    def moved_box(self, macro):
+        # Para una secuencia de empujes de una misma caja: (celda inicial de la caja, celda final
+        # del jugador, celda final de la caja).
+        player, direction = macro[-1]
+        return macro[0][0], player, self.board.moves[player][direction]
+
+    def pushes_to_steps(self, pushes, player, box_bits):
+        # Reproduce los empujes intercalando los caminos del jugador entre ellos.
+        moves = self.board.moves
+        steps = []
+        for box, direction in pushes:
+            steps.extend(self.board.walk(player, moves[box][direction ^ 2], box_bits))
+            steps.append(DIRECTIONS[direction])
+            box_bits ^= (1 << box) ^ (1 << moves[box][direction])
+            player = box
+        return steps
@@ -0,0 +1,61 @@
+import sys
+import time
+
+INT_BYTES = sys.getsizeof(2 ** 100)
+# Tamaño aproximado de una clave de estado (entero empaquetado de varias palabras).
+DICT_SLOT_BYTES = 3 * 8 * 3 // 2
+# Hash, clave y valor por entrada, con el factor de carga habitual de un dict.
+TUPLE_BYTES = sys.getsizeof((0, 0, 0))
+
+
+class SolverStats:
+    def __init__(self):
+        # Contadores de una búsqueda; `Solver` los rellena y se devuelven junto al camino.
+        self.status = None
+        self.cache_hit = False
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.duplicate_hits = 0
+        # Hijos descartados porque el estado ya se conocía con un coste igual o menor.
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.memory_bytes = 0
+        self.time_neighbors = 0.0
+        self.time_heuristic = 0.0
+        self.time_heap = 0.0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes_expanded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def update_peaks(self, frontier, closed, memory=None):
+        # Registra los tamaños máximos y la memoria de las estructuras de búsqueda. Si no se
+        # indica `memory`, se estima para un A* con `cost_so_far` y `came_from`.
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+        if closed > self.peak_closed:
+            self.peak_closed = closed
+        if memory is None:
+            memory = closed * (2 * DICT_SLOT_BYTES + INT_BYTES + TUPLE_BYTES) + frontier * (8 + TUPLE_BYTES)
+            # Cada estado cerrado ocupa una entrada en cada dict; cada abierto, una tupla en el heap.
+        if memory > self.memory_bytes:
+            self.memory_bytes = memory
+
+    def as_dict(self):
+        return {
+            'status': self.status,
+            'cache_hit': self.cache_hit,
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_generated': self.nodes_generated,
+            'duplicate_hits': self.duplicate_hits,
+            'peak_frontier': self.peak_frontier,
+            'peak_closed': self.peak_closed,
+            'memory_bytes': self.memory_bytes,
+            'time_neighbors': round(self.time_neighbors, 4),
+            'time_heuristic': round(self.time_heuristic, 4),
+            'time_heap': round(self.time_heap, 4),
+            'elapsed': round(self.elapsed, 4),
+            'nodes_per_second': round(self.nodes_per_second, 1),
+        }
@@ -0,0 +1,38 @@
+from collections import OrderedDict
+
+import pygame
+
+SPRITE_CACHE_SIZE = 64
+# Sprites escalados que se conservan; al superarlo se expulsan los usados hace más tiempo.
+
+
+class SpriteCache:
+    def __init__(self, assets, limit=SPRITE_CACHE_SIZE):
+        # Sprites escalados por (imagen, tamaño de tile), ya convertidos al formato de la pantalla
+        # con `convert_alpha`, para que el dibujo de cada frame no tenga que escalar nada.
+        # Las imágenes originales se piden una sola vez al `AssetManager` compartido.
+        self.assets = assets
+        self.limit = limit
+        self.sprites = OrderedDict()
+
+    def load(self, name, path):
+        self.assets.request('sprites', name, path)
+
+    def get(self, name, size):
+        key = (name, size)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+        sprite = self.assets.prescaled(name, (size, size))
+        if sprite is None:
+            sprite = pygame.transform.smoothscale(self.assets.get(name), (size, size))
+        sprite = sprite.convert_alpha()
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.limit:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def tiles(self, names, size):
+        # Diccionario nombre -> sprite de un juego de tiles para un tamaño dado.
+        return {name: self.get(name, size) for name in names}
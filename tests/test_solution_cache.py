@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from level_pack import HeadlessLevel, load_levels
+from solution_cache import SolutionCache
+from solver import Solver
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+class SolutionCacheTest(unittest.TestCase):
+    def test_cached_solution_has_same_length(self):
+        # Una solución servida desde el almacén no debe dar rodeos respecto a la recién calculada.
+        level_data = load_levels(os.path.join(BENCHMARK_DIR, '02_medium.xsb'))[1]
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SolutionCache(os.path.join(directory, 'solutions.cache'))
+            first, stats = Solver(cache=cache).solve_with_stats(HeadlessLevel(level_data))
+            self.assertEqual(stats.status, 'solved')
+            self.assertFalse(stats.cache_hit)
+            second, stats = Solver(cache=cache).solve_with_stats(HeadlessLevel(level_data))
+            self.assertTrue(stats.cache_hit)
+            self.assertEqual(len(second), len(first))
+        level = HeadlessLevel(level_data)
+        for dx, dy in second:
+            self.assertIsNotNone(level.move_player(dx, dy))
+        self.assertTrue(level.is_completed())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+from collections import OrderedDict
+
+TEXT_CACHE_SIZE = 128
+# Textos renderizados que se conservan; al superarlo se expulsan los usados hace más tiempo.
+
+
+class TextCache:
+    def __init__(self, limit=TEXT_CACHE_SIZE):
+        # Superficies de texto por (fuente, texto, color): un texto que no cambia entre frames
+        # (el nivel, los pasos mientras no se mueve el jugador) se renderiza una sola vez.
+        self.limit = limit
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.limit:
+            self.surfaces.popitem(last=False)
+        return surface
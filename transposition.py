@@ -0,0 +1,54 @@
+from array import array
+# arreglos tipados: cada entrada ocupa un número fijo de bytes.
+
+SLOT_BYTES = 8 + 2 + 2 + 2
+# Bytes por entrada: hash Zobrist, coste g, cota h aprendida e iteración.
+MAX_VALUE = 0xFFFF
+
+
+class TranspositionTable:
+    def __init__(self, memory_mb):
+        # Reserva de una vez una tabla de tamaño fijo (potencia de dos) que cabe en `memory_mb`.
+        slots = max(1, int(memory_mb * 1024 * 1024) // SLOT_BYTES)
+        self.size = 1 << (slots.bit_length() - 1)
+        self.mask = self.size - 1
+        self.hashes = array('Q', bytes(8 * self.size))
+        self.costs = array('H', bytes(2 * self.size))
+        self.bounds = array('H', bytes(2 * self.size))
+        self.iterations = array('H', bytes(2 * self.size))
+        # La iteración 0 marca una entrada vacía.
+        self.stored = 0
+        self.replaced = 0
+
+    def memory_bytes(self):
+        # Memoria ocupada por la tabla, independiente del número de estados visitados.
+        return self.size * SLOT_BYTES
+
+    def probe(self, zobrist):
+        # Devuelve (g, h aprendida, iteración) si la entrada pertenece a este estado, o None.
+        slot = zobrist & self.mask
+        if self.iterations[slot] and self.hashes[slot] == zobrist:
+            return self.costs[slot], self.bounds[slot], self.iterations[slot]
+        return None
+
+    def store(self, zobrist, cost, bound, iteration):
+        # Política de reemplazo: se conserva la entrada existente solo si es de esta misma
+        # iteración y está más cerca de la raíz (su subárbol ahorra más trabajo).
+        slot = zobrist & self.mask
+        if self.iterations[slot] and self.hashes[slot] != zobrist:
+            if self.iterations[slot] == iteration and self.costs[slot] < cost:
+                return False
+            self.replaced += 1
+        elif not self.iterations[slot]:
+            self.stored += 1
+        self.hashes[slot] = zobrist
+        self.costs[slot] = min(cost, MAX_VALUE)
+        self.bounds[slot] = min(bound, MAX_VALUE)
+        self.iterations[slot] = iteration
+        return True
+
+    def raise_bound(self, zobrist, bound):
+        # Guarda una cota inferior mejorada aprendida al agotar el subárbol de un estado.
+        slot = zobrist & self.mask
+        if self.iterations[slot] and self.hashes[slot] == zobrist and self.bounds[slot] < bound:
+            self.bounds[slot] = min(bound, MAX_VALUE)
@@ -0,0 +1,84 @@
+import os
+import queue
+import threading
+
+import pygame
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+    # Sin OpenCV no hay vídeo: `VideoStream` queda sin fotogramas y la celebración sigue sin él.
+
+BUFFER_FRAMES = 8
+# Fotogramas decodificados por adelantado; el hilo se detiene cuando el búfer está lleno.
+STOP_TIMEOUT = 1.0
+
+
+class VideoStream:
+    def __init__(self, path, size, buffer_frames=BUFFER_FRAMES):
+        # Reproduce un vídeo en bucle decodificándolo en un hilo aparte hacia un búfer acotado,
+        # en lugar de cargar todos los fotogramas en memoria. `size` es el tamaño de salida.
+        self.path = path
+        self.size = size
+        self.frames = queue.Queue(maxsize=buffer_frames)
+        self.stopped = threading.Event()
+        self.thread = None
+        self.current = None
+        # Último fotograma mostrado: se repite si el decodificador va por detrás.
+
+    @property
+    def available(self):
+        return cv2 is not None and os.path.exists(self.path)
+
+    def start(self):
+        if not self.available:
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.decode, daemon=True)
+        self.thread.start()
+
+    def decode(self):
+        # Hilo decodificador: lee, convierte a RGB y escala; al terminar el vídeo vuelve al principio.
+        capture = cv2.VideoCapture(self.path)
+        try:
+            if not capture.isOpened():
+                return
+            decoded = False
+            while not self.stopped.is_set():
+                ret, frame = capture.read()
+                if not ret:
+                    if not decoded or not capture.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                        return
+                    decoded = False
+                    continue
+                    # Vuelve al principio; si el archivo está vacío o no admite saltos, se acaba.
+                decoded = True
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                frame = cv2.resize(frame, self.size)
+                while not self.stopped.is_set():
+                    try:
+                        self.frames.put(frame.tobytes(), timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+        finally:
+            capture.release()
+
+    def next_frame(self):
+        # Siguiente fotograma como superficie de pygame, sin esperar; None si aún no hay ninguno.
+        try:
+            data = self.frames.get_nowait()
+        except queue.Empty:
+            return self.current
+        self.current = pygame.image.frombuffer(data, self.size, 'RGB')
+        return self.current
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(STOP_TIMEOUT)
+            self.thread = None
+        while not self.frames.empty():
+            self.frames.get_nowait()
+        self.current = None